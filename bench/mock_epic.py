@@ -0,0 +1,281 @@
+"""Local stand-in for the Epic account / MCP services and fortnite-api.com.
+
+    python bench/mock_epic.py --port 8765 --latency 0.05 --shop-size 60
+    GIFTBOT_API_BASE=http://127.0.0.1:8765 python main.py
+
+Implements the endpoints the bot calls (oauth/token, deviceAuthorization,
+exchange, deviceAuth, account and displayName lookups, QueryProfile,
+GiftCatalogEntry and /v2/shop) with configurable latency, error injection
+and a synthetic shop of any size. Bots get ``balance`` V-Bucks the first
+time they are seen; recipients are ``player<N>``, any other name is 404.
+With ``gift_interval`` a bot gifting faster than that gets a 429
+``errors.com.epicgames.common.throttled`` with Retry-After, and every device
+code is reported pending once before it is approved.
+"""
+
+import argparse, hashlib, json, random, re, threading, time, uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+PRICES = (500, 800, 1200, 1500, 2000)
+RARITIES = ("uncommon", "rare", "epic", "legendary")
+TYPES = ("outfit", "emote", "pickaxe", "glider", "backpack", "wrap")
+
+
+def account_id(name):
+    return hashlib.md5(name.lower().encode()).hexdigest()
+
+
+def synthetic_shop(size, seed=1, jam_tracks=5):
+    rnd = random.Random(seed)
+    entries, items = [], []
+    for i in range(size):
+        if i and i % 10 == 0 and len(items) >= 2:
+            br = rnd.sample(items, 2)
+            entries.append({"offerId": f"v2:/{uuid.UUID(int=rnd.getrandbits(128)).hex}", "devName": f"[VIRTUAL]1 x Bundle {i} for {sum(PRICES[:2])} MtxCurrency",
+                            "finalPrice": 1800, "regularPrice": 2300, "giftable": True, "bundle": {"name": f"Bundle {i}"}, "brItems": br})
+            continue
+        item = {"id": f"Item_{i}", "name": f"Item {i}", "type": {"value": rnd.choice(TYPES)}, "rarity": {"value": rnd.choice(RARITIES)}}
+        items.append(item)
+        price = rnd.choice(PRICES)
+        entries.append({"offerId": f"v2:/{uuid.UUID(int=rnd.getrandbits(128)).hex}", "devName": f"[VIRTUAL]1 x {item['name']} for {price} MtxCurrency",
+                        "finalPrice": price, "regularPrice": price, "giftable": rnd.random() > 0.05, "brItems": [item]})
+    for j in range(jam_tracks):
+        entries.append({"offerId": f"v2:/jam{j:028d}", "finalPrice": 500, "giftable": True, "tracks": [{"id": f"jt{j}"}],
+                        "layout": {"id": f"JT{j}", "name": "Jam Tracks"}, "devName": f"Jam Track {j}"})
+    return entries
+
+
+def epic_error(code, message, status=400):
+    return status, {"errorCode": code, "errorMessage": message, "numericErrorCode": 1000, "originatingService": "mock"}
+
+
+class MockEpic:
+    def __init__(self, port=0, latency=0.0, jitter=0.0, shop_size=60, balance=10000, gift_limit=5, owned_rate=0.0,
+                 no_funds_rate=0.0, error_rate=0.0, dead_accounts=(), seed=1, gift_interval=0.0):
+        self.latency = latency
+        self.jitter = jitter
+        self.balance = balance
+        self.gift_limit = gift_limit
+        self.owned_rate = owned_rate
+        self.no_funds_rate = no_funds_rate
+        self.error_rate = error_rate
+        self.dead_accounts = set(dead_accounts)
+        self.gift_interval = gift_interval
+        self.pending_codes = set()
+        self.shop = {"status": 200, "data": {"entries": synthetic_shop(shop_size, seed)}}
+        self.shop_body = json.dumps(self.shop).encode()
+        self.etag = '"' + hashlib.md5(self.shop_body).hexdigest() + '"'
+        self.counts = {}
+        self.bots = {}
+        self.owned = set()
+        self.rnd = random.Random(seed)
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset_counts(self):
+        with self._lock:
+            self.counts.clear()
+
+    def _bot(self, aid):
+        with self._lock:
+            return self.bots.setdefault(aid, {"mtx": self.balance, "sent": [], "last": 0.0})
+
+    def _roll(self, rate):
+        with self._lock:
+            return rate > 0 and self.rnd.random() < rate
+
+    def _profile(self, aid):
+        b = self._bot(aid)
+        sent_to = {r: time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(t)) for t, r in b["sent"]}
+        return {"_id": aid, "accountId": aid, "profileId": "common_core", "rvn": len(b["sent"]) + 1,
+                "items": {"mtx-purchased": {"templateId": "Currency:MtxPurchased", "quantity": b["mtx"]}},
+                "stats": {"attributes": {"gift_history": {"num_sent": len(b["sent"]), "sentTo": sent_to, "gifts": [
+                    {"date": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(t)), "toAccountId": r} for t, r in b["sent"]]}}}}
+
+    # route handlers return (status, body[, headers])
+
+    def token(self, h, form):
+        grant = form.get("grant_type")
+        aid = form.get("account_id") or account_id("bot-" + uuid.uuid4().hex[:8])
+        if grant == "device_auth" and aid in self.dead_accounts:
+            return epic_error("errors.com.epicgames.account.invalid_account_credentials", "Sorry the account credentials you are using are invalid")
+        if grant == "device_code" and form.get("device_code") in self.pending_codes:
+            with self._lock:
+                self.pending_codes.discard(form.get("device_code"))
+            return epic_error("errors.com.epicgames.account.oauth.authorization_pending", "The authorization server request is still pending")
+        if grant not in ("client_credentials", "device_auth", "device_code", "exchange_code"):
+            return epic_error("errors.com.epicgames.common.oauth.unsupported_grant_type", f"Unsupported grant type: {grant}")
+        exp = time.time() + 7200
+        return 200, {"access_token": uuid.uuid4().hex, "expires_in": 7200, "token_type": "bearer", "account_id": aid,
+                     "expires_at": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(exp))}
+
+    def device_authorization(self, h, form):
+        code = uuid.uuid4().hex
+        with self._lock:
+            self.pending_codes.add(code)
+        return 200, {"device_code": code, "user_code": "MOCK1234", "interval": 1, "expires_in": 600,
+                     "verification_uri_complete": f"{self.url}/activate?userCode=MOCK1234"}
+
+    def exchange(self, h, form):
+        return 200, {"code": uuid.uuid4().hex, "expiresInSeconds": 300, "creatingClientId": "mock"}
+
+    def device_auth(self, h, form, aid):
+        return 200, {"deviceId": uuid.uuid4().hex, "accountId": aid, "secret": uuid.uuid4().hex}
+
+    def account(self, h, form, aid):
+        return 200, {"id": aid, "displayName": f"bot-{aid[:6]}", "email": f"{aid[:6]}@mock.invalid"}
+
+    def display_name(self, h, form, name):
+        if not re.fullmatch(r"player\d+", name.lower()):
+            return epic_error("errors.com.epicgames.account.account_not_found", f"Sorry, we couldn't find an account for {name}", 404)
+        return 200, {"id": account_id(name), "displayName": name}
+
+    def accounts(self, h, form):
+        ids = form.get("accountId") or []
+        names = {account_id(f"player{i}"): f"player{i}" for i in range(1000)}
+        return 200, [{"id": a, "displayName": names[a]} for a in ids if a in names]
+
+    def query_profile(self, h, form, aid):
+        return 200, {"profileRevision": 1, "profileId": "common_core", "profileChanges": [{"changeType": "fullProfileUpdate", "profile": self._profile(aid)}]}
+
+    def gift(self, h, body, aid):
+        offer, price = body.get("offerId"), int(body.get("expectedTotalPrice") or 0)
+        receivers = body.get("receiverAccountIds") or []
+        entry = next((e for e in self.shop["data"]["entries"] if e["offerId"] == offer), None)
+        if not entry or not entry.get("giftable", True):
+            return epic_error("errors.com.epicgames.validation.invalid_parameter", f"Offer {offer} is not giftable")
+        if any((r, offer) in self.owned for r in receivers) or self._roll(self.owned_rate):
+            return epic_error("errors.com.epicgames.modules.gamesubcatalog.receiver_owns_item", "User already owns this item")
+        b = self._bot(aid)
+        with self._lock:
+            now = time.time()
+            wait = b["last"] + self.gift_interval - now
+            if wait > 0:
+                status, err = epic_error("errors.com.epicgames.common.throttled",
+                                         f"Operation access is limited by throttling policy, please try again in {wait:.0f} second(s).", 429)
+                err["messageVars"] = [f"{wait:.0f}"]
+                return status, err, {"Retry-After": f"{max(wait, 1):.0f}"}
+            b["last"] = now
+            if sum(1 for t, _ in b["sent"] if t > now - 86400) >= self.gift_limit:
+                return epic_error("errors.com.epicgames.modules.gamesubcatalog.gift_limit_reached", "You have reached your gift limit")
+            if b["mtx"] < price or (self.no_funds_rate and self.rnd.random() < self.no_funds_rate):
+                return epic_error("errors.com.epicgames.modules.gameplayutils.not_enough_mtx", "Purchase not allowed: not enough V-Bucks")
+            b["mtx"] -= price
+            for r in receivers:
+                b["sent"].append((now, r))
+                self.owned.add((r, offer))
+        return 200, {"profileRevision": len(b["sent"]) + 1, "profileId": "common_core", "notifications": [],
+                     "profileChanges": [{"changeType": "itemQuantityChanged", "itemId": "mtx-purchased", "quantity": b["mtx"]}]}
+
+    def shop_get(self, h, form):
+        if h.headers.get("If-None-Match") == self.etag:
+            return 304, None, {"ETag": self.etag}
+        return 200, self.shop_body, {"ETag": self.etag}
+
+    ROUTES = (
+        ("POST", r"/account/api/oauth/token", "token"),
+        ("POST", r"/account/api/oauth/deviceAuthorization", "device_authorization"),
+        ("GET", r"/account/api/oauth/exchange", "exchange"),
+        ("POST", r"/account/api/public/account/(\w+)/deviceAuth", "device_auth"),
+        ("GET", r"/account/api/public/account/displayName/([^/]+)", "display_name"),
+        ("GET", r"/account/api/public/account", "accounts"),
+        ("GET", r"/account/api/public/account/(\w+)", "account"),
+        ("POST", r"/fortnite/api/game/v2/profile/(\w+)/client/QueryProfile", "query_profile"),
+        ("POST", r"/fortnite/api/game/v2/profile/(\w+)/client/GiftCatalogEntry", "gift"),
+        ("GET", r"/v2/shop", "shop_get"),
+    )
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *a):
+                pass
+
+            def _dispatch(self, method):
+                parts = urlsplit(self.path)
+                n = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(n) if n else b""
+                for m, pattern, name in mock.ROUTES:
+                    match = re.fullmatch(pattern, parts.path)
+                    if m == method and match:
+                        break
+                else:
+                    return self._send(*epic_error("errors.com.epicgames.common.not_found", "Not found", 404))
+                with mock._lock:
+                    mock.counts[name] = mock.counts.get(name, 0) + 1
+                if mock.latency or mock.jitter:
+                    time.sleep(mock.latency + random.random() * mock.jitter)
+                if name != "shop_get" and mock._roll(mock.error_rate):
+                    return self._send(*epic_error("errors.com.epicgames.common.server_error", "Internal server error", 503))
+                if "json" in (self.headers.get("Content-Type") or ""):
+                    form = json.loads(raw or b"{}")
+                else:
+                    qs = parse_qs(parts.query)
+                    form = {k: v[0] for k, v in parse_qs(raw.decode()).items()}
+                    form.update({k: (v if k == "accountId" else v[0]) for k, v in qs.items()})
+                self._send(*getattr(mock, name)(self, form, *match.groups()))
+
+            def _send(self, status, body, headers=None):
+                data = body if isinstance(body, bytes) else (b"" if body is None else json.dumps(body).encode())
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+        return Handler
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Local mock of the Epic / fortnite-api endpoints used by the gift bot.")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    ap.add_argument("--jitter", type=float, default=0.0, help="extra random latency, up to this many seconds")
+    ap.add_argument("--shop-size", type=int, default=60)
+    ap.add_argument("--balance", type=int, default=10000, help="V-Bucks each bot starts with")
+    ap.add_argument("--gift-limit", type=int, default=5, help="gifts per bot per 24h")
+    ap.add_argument("--owned-rate", type=float, default=0.0, help="share of gifts answered with receiver_owns_item")
+    ap.add_argument("--no-funds-rate", type=float, default=0.0, help="share of gifts answered with not_enough_mtx")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with a 503")
+    ap.add_argument("--gift-interval", type=float, default=0.0, help="seconds a bot must wait between gifts before it is throttled")
+    ap.add_argument("--dead", action="append", default=[], help="accountId whose device auth is rejected (repeatable)")
+    a = ap.parse_args(argv)
+    mock = MockEpic(a.port, a.latency, a.jitter, a.shop_size, a.balance, a.gift_limit, a.owned_rate, a.no_funds_rate, a.error_rate, a.dead,
+                    gift_interval=a.gift_interval)
+    print(f"Mock Epic listening on {mock.url} (GIFTBOT_API_BASE={mock.url})")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
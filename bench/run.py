@@ -0,0 +1,145 @@
+"""End-to-end benchmark of the gift-item and gift-shop flows against bench/mock_epic.py.
+
+    python bench/run.py --bots 8 --latency 0.03 --shop-size 60 --gifts 40
+
+Runs entirely offline in a temp directory and reports requests per gift,
+p50/p99 gift and request latency (from giftbot.metrics) and total run time
+for each flow.
+"""
+
+import argparse, base64, json, os, random, sys, tempfile, time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.dirname(HERE))
+
+from mock_epic import MockEpic  # noqa: E402
+
+
+def pct(values, p):
+    if not values:
+        return 0.0
+    v = sorted(values)
+    return v[min(len(v) - 1, int(round(p / 100 * (len(v) - 1))))]
+
+
+def report(name, mock, metrics, outcomes, wall):
+    served = sum(mock.counts.values())
+    requests = [t for cat, ts in metrics.latencies.items() if cat != "gift_attempt" for t in ts]
+    attempted = len(outcomes)
+    return {
+        "flow": name,
+        "gifts": attempted,
+        "sent": outcomes.count("sent"),
+        "skipped": outcomes.count("skipped"),
+        "failed": attempted - outcomes.count("sent") - outcomes.count("skipped"),
+        "requests": served,
+        "requestsPerGift": round(served / attempted, 2) if attempted else 0.0,
+        "byEndpoint": dict(sorted(mock.counts.items())),
+        "giftP50Ms": round(pct(metrics.latencies["gift_attempt"], 50) * 1000, 1),
+        "giftP99Ms": round(pct(metrics.latencies["gift_attempt"], 99) * 1000, 1),
+        "requestP50Ms": round(pct(requests, 50) * 1000, 1),
+        "requestP99Ms": round(pct(requests, 99) * 1000, 1),
+        "wallSeconds": round(wall, 3),
+    }
+
+
+def gift_item_flow(n, accs, recipients, quota):
+    """Option 5: one item for one recipient, n times, sharing tokens and bot state like the menu does."""
+    from giftbot.auth import TokenManager
+    from giftbot.gifting import gift_entry
+    from giftbot.resolve import resolve_recipient
+    from giftbot.scheduler import BotScheduler
+    from giftbot.shop import load_shop
+
+    tokens = TokenManager(background=False)
+    scheduler = BotScheduler(accs, tokens, daily_quota=quota)
+    rnd = random.Random(7)
+    outcomes = []
+    for k in range(n):
+        shop = load_shop()
+        entry = shop.find(rnd.choice([e["name"] for e in shop.entries if e.get("giftable", True)]))
+        rid = resolve_recipient(rnd.choice(recipients), tokens, accs)
+        outcome, _ = gift_entry(entry, rid, tokens, scheduler)
+        outcomes.append(outcome)
+    return outcomes
+
+
+def gift_shop_flow(accs, recipient, workers, quota):
+    """Option 6: the planned shop for one recipient through the concurrent engine."""
+    from giftbot.auth import TokenManager
+    from giftbot.gifting import ShopGifter
+    from giftbot.resolve import resolve_recipient
+    from giftbot.plan import plan_gifts
+    from giftbot.scheduler import BotScheduler
+    from giftbot.shop import load_shop
+
+    tokens = TokenManager(background=False)
+    scheduler = BotScheduler(accs, tokens, daily_quota=quota)
+    giftable = plan_gifts(load_shop().entries).entries
+    rid = resolve_recipient(recipient, tokens, accs)
+    engine = ShopGifter(accs[:workers], tokens, rid, default_pacing=0, scheduler=scheduler)
+    return [o for _, _, o in engine.run(giftable)]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Benchmark the gifting flows against the local mock server.")
+    ap.add_argument("--bots", type=int, default=8)
+    ap.add_argument("--workers", type=int, default=0, help="bots used in parallel by gift-shop (default: all)")
+    ap.add_argument("--gifts", type=int, default=40, help="single-item gifts in the gift-item flow")
+    ap.add_argument("--recipients", type=int, default=20)
+    ap.add_argument("--shop-size", type=int, default=60)
+    ap.add_argument("--latency", type=float, default=0.03)
+    ap.add_argument("--jitter", type=float, default=0.01)
+    ap.add_argument("--balance", type=int, default=100000)
+    ap.add_argument("--gift-limit", type=int, default=1000)
+    ap.add_argument("--owned-rate", type=float, default=0.1)
+    ap.add_argument("--no-funds-rate", type=float, default=0.0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--gift-interval", type=float, default=0.0, help="mock throttles a bot gifting more often than this")
+    ap.add_argument("--flow", choices=("all", "gift-item", "gift-shop"), default="all")
+    ap.add_argument("--metrics", metavar="FILE", help="also write every request / gift event to FILE (JSONL)")
+    ap.add_argument("--json", action="store_true")
+    a = ap.parse_args(argv)
+
+    mock = MockEpic(0, a.latency, a.jitter, a.shop_size, a.balance, a.gift_limit, a.owned_rate, a.no_funds_rate, a.error_rate,
+                    gift_interval=a.gift_interval)
+    os.environ["GIFTBOT_API_BASE"] = mock.start()
+    os.chdir(tempfile.mkdtemp(prefix="giftbot-bench-"))
+    accs = [{"accountId": f"{i:032x}", "deviceId": base64.b64encode(f"dev{i}".encode()).decode(),
+             "secret": base64.b64encode(f"sec{i}".encode()).decode(), "displayName": f"bot{i}"} for i in range(a.bots)]
+    with open("config.json", "w") as f:
+        json.dump(accs, f, indent=4)
+
+    from giftbot.metrics import metrics
+    if a.metrics:
+        metrics.open(a.metrics)
+
+    results = []
+    if a.flow in ("all", "gift-item"):
+        mock.reset_counts(), metrics.reset()
+        t0 = time.perf_counter()
+        outcomes = gift_item_flow(a.gifts, accs, [f"player{i}" for i in range(a.recipients)], a.gift_limit)
+        results.append(report("gift-item", mock, metrics, outcomes, time.perf_counter() - t0))
+    if a.flow in ("all", "gift-shop"):
+        mock.reset_counts(), metrics.reset()
+        t0 = time.perf_counter()
+        outcomes = gift_shop_flow(accs, f"player{a.recipients + 1}", a.workers or a.bots, a.gift_limit)
+        results.append(report("gift-shop", mock, metrics, outcomes, time.perf_counter() - t0))
+    mock.stop()
+
+    if a.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    cols = ("flow", "gifts", "sent", "skipped", "failed", "requests", "requestsPerGift", "giftP50Ms", "giftP99Ms", "requestP50Ms", "requestP99Ms", "wallSeconds")
+    rows = [cols] + [tuple(str(r[c]) for c in cols) for r in results]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(cols))]
+    for row in rows:
+        print("  ".join(c.rjust(w) for c, w in zip(row, widths)))
+    for r in results:
+        print(f"\n{r['flow']} requests by endpoint: " + ", ".join(f"{k}={v}" for k, v in r["byEndpoint"].items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
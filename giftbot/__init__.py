@@ -0,0 +1,3 @@
+"""Fortnite GiftBot core: auth, shop and gifting helpers shared by the panel."""
+
+__version__ = "1.0.5"
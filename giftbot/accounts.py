@@ -0,0 +1,137 @@
+"""Account store for config.json: loaded once, indexed by accountId, shared safely.
+
+Reads are served from memory and reloaded only when the file changes on
+disk. Every change re-reads the file under an exclusive lock and is written
+to a temp file and renamed into place, so several gifting processes can
+share one account pool without losing or corrupting accounts.
+"""
+
+import contextlib, json, os, tempfile, threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+CONFIG = "config.json"
+
+
+@contextlib.contextmanager
+def file_lock(path):
+    """Exclusive inter-process lock on ``path`` + ".lock"."""
+    with open(path + ".lock", "a+") as f:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def atomic_write_json(path, data, **kw):
+    d = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(dir=d, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, **kw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp)
+        raise
+
+
+class AccountStore:
+    def __init__(self, path=CONFIG):
+        self.path = path
+        self._accounts = []
+        self._by_id = {}
+        self._stamp = None
+        self._lock = threading.RLock()
+
+    def _mtime(self):
+        try:
+            st = os.stat(self.path)
+            return st.st_mtime_ns, st.st_size
+        except OSError:
+            return None
+
+    def _read(self):
+        try:
+            with open(self.path, "r") as f:
+                accs = json.load(f)
+        except (OSError, ValueError):
+            accs = []
+        self._set(accs if isinstance(accs, list) else [])
+        self._stamp = self._mtime()
+
+    def _set(self, accs):
+        self._accounts = accs
+        self._by_id = {a["accountId"]: a for a in accs if a.get("accountId")}
+
+    def all(self):
+        """Current accounts, reloaded only when config.json changed since the last read."""
+        with self._lock:
+            if self._stamp is None or self._mtime() != self._stamp:
+                self._read()
+            return list(self._accounts)
+
+    def get(self, account_id):
+        self.all()
+        return self._by_id.get(account_id)
+
+    @contextlib.contextmanager
+    def _edit(self):
+        """Re-read the file under the lock and yield the accounts to change; the file is only rewritten if they changed."""
+        with self._lock, file_lock(self.path):
+            self._read()
+            before = [dict(a) for a in self._accounts]
+            accs = list(self._accounts)
+            yield accs
+            if accs != before:
+                atomic_write_json(self.path, accs, indent=4)
+                self._set(accs)
+                self._stamp = self._mtime()
+
+    def add(self, acc):
+        """Add a device auth; False if the account is already linked."""
+        with self._edit() as accs:
+            if any(a["accountId"] == acc["accountId"] for a in accs):
+                return False
+            accs.append(acc)
+        return True
+
+    def remove(self, account_id):
+        with self._edit() as accs:
+            n = len(accs)
+            accs[:] = [a for a in accs if a["accountId"] != account_id]
+        return len(accs) != n
+
+    def update_meta(self, account_id, **meta):
+        """Cache per-account metadata (displayName, email, ...) alongside its device auth."""
+        meta = {k: v for k, v in meta.items() if v is not None}
+        cur = self.get(account_id)
+        if not cur or all(cur.get(k) == v for k, v in meta.items()):
+            return
+        with self._edit() as accs:
+            for a in accs:
+                if a["accountId"] == account_id:
+                    a.update(meta)
+
+
+store = AccountStore()
@@ -0,0 +1,168 @@
+"""Access-token cache keyed by accountId.
+
+Tokens are reused until shortly before ``expires_at`` and refreshed in the
+background so gifting loops never pay for a device_auth grant per item.
+"""
+
+import base64, threading, time
+from datetime import datetime
+
+import requests
+
+from .client import client
+from .epic import ACCOUNT, TOKEN_URL, IOS_AUTH, SWITCH_AUTH, device_auth_form
+from .metrics import bot_context, error_code
+from .pacing import is_throttled, retry_after
+
+FORM = "application/x-www-form-urlencoded"
+
+
+def _expiry(d):
+    try:
+        return datetime.fromisoformat(d["expires_at"].replace("Z", "+00:00")).timestamp()
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return time.time() + int(d.get("expires_in") or 0)
+
+
+def exchange_code(token):
+    """One-time exchange code for the account behind ``token``, or None."""
+    r = client.get(ACCOUNT + "/oauth/exchange", headers={"Authorization": "Bearer " + token})
+    return r.json().get("code") if r.status_code == 200 else None
+
+
+def start_device_login():
+    """Begin the device-code flow; the response holds device_code and verification_uri_complete."""
+    r = client.post(TOKEN_URL, headers={"Authorization": SWITCH_AUTH, "Content-Type": FORM},
+        data={"grant_type": "client_credentials"}, idempotent=True).json()
+    return client.post(ACCOUNT + "/oauth/deviceAuthorization", headers={"Authorization": "Bearer " + r["access_token"]}).json()
+
+
+def poll_device_login(auth, interval=None):
+    """Block until the user approves the device code; returns the token response, or None once the code expires.
+
+    Polls every ``interval`` seconds as returned by deviceAuthorization and
+    slows down when the token endpoint throttles or answers ``slow_down``.
+    """
+    interval = interval or auth.get("interval") or 10
+    deadline = time.monotonic() + (auth.get("expires_in") or 600)
+    while time.monotonic() + interval < deadline:
+        time.sleep(interval)
+        resp = client.post(TOKEN_URL, headers={"Authorization": SWITCH_AUTH, "Content-Type": FORM},
+            data={"grant_type": "device_code", "device_code": auth["device_code"]})
+        if is_throttled(resp) or (error_code(resp) or "").endswith("slow_down"):
+            interval = max(interval + 5, retry_after(resp) or 0)
+        elif resp.status_code != 400:
+            return resp.json()
+    return None
+
+
+def create_device_auth(login):
+    """Turn a device-code login into a config.json device auth (iOS client), with displayName when available."""
+    account_id, access_token = login["account_id"], login["access_token"]
+    exch = client.get(ACCOUNT + "/oauth/exchange", headers={"Authorization": "Bearer " + access_token}).json()["code"]
+    tok = client.post(TOKEN_URL, headers={"Authorization": IOS_AUTH, "Content-Type": FORM},
+        data={"grant_type": "exchange_code", "exchange_code": exch}).json()["access_token"]
+    dev = client.post(f"{ACCOUNT}/public/account/{account_id}/deviceAuth", headers={"Authorization": "Bearer " + tok}).json()
+    device_auth = {"accountId": account_id, "deviceId": base64.b64encode(dev["deviceId"].encode()).decode(), "secret": base64.b64encode(dev["secret"].encode()).decode()}
+    try:
+        rr = client.get(f"{ACCOUNT}/public/account/{account_id}", headers={"Authorization": "Bearer " + access_token}, timeout=10)
+        if rr.status_code == 200:
+            device_auth["displayName"] = rr.json().get("displayName") or rr.json().get("name") or "Unknown"
+    except requests.RequestException:
+        pass
+    return device_auth
+
+
+class TokenManager:
+    def __init__(self, margin=300, background=True):
+        self.margin = margin
+        self.background = background
+        self.grants = 0
+        self.reused = 0
+        self._tokens = {}
+        self.errors = {}
+        self._timers = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def _acc_lock(self, account_id):
+        with self._lock:
+            return self._locks.setdefault(account_id, threading.Lock())
+
+    def _fresh(self, account_id):
+        t = self._tokens.get(account_id)
+        if t and t[1] - self.margin > time.time():
+            return t[0]
+        return None
+
+    def get(self, acc, fresh=False):
+        """Access token for ``acc`` or None when the device auth is rejected (reason in ``errors``).
+
+        ``fresh`` forces a new device_auth grant, e.g. to verify the device auth still works.
+        """
+        aid = acc["accountId"]
+        tok = None if fresh else self._fresh(aid)
+        if tok:
+            self.reused += 1
+            return tok
+        with self._acc_lock(aid):
+            tok = None if fresh else self._fresh(aid)
+            if tok:
+                self.reused += 1
+                return tok
+            return self._grant(acc)
+
+    def _grant(self, acc):
+        with bot_context(acc):
+            return self._device_grant(acc)
+
+    def _device_grant(self, acc):
+        aid = acc["accountId"]
+        try:
+            r = client.post(TOKEN_URL, headers={"Authorization": IOS_AUTH, "Content-Type": FORM},
+                data=device_auth_form(acc), idempotent=True)
+        except requests.RequestException as e:
+            self.errors[aid] = f"network: {type(e).__name__}"
+            return None
+        self.grants += 1
+        try:
+            d = r.json()
+        except ValueError:
+            d = {}
+        if r.status_code != 200:
+            self._tokens.pop(aid, None)
+            self.errors[aid] = d.get("errorCode") or f"HTTP {r.status_code}"
+            return None
+        tok, exp = d.get("access_token"), _expiry(d)
+        if not tok:
+            self.errors[aid] = "no access_token"
+            return None
+        self.errors.pop(aid, None)
+        self._tokens[aid] = (tok, exp)
+        if self.background:
+            self._schedule(acc, exp)
+        return tok
+
+    def _schedule(self, acc, exp):
+        aid = acc["accountId"]
+        old = self._timers.pop(aid, None)
+        if old:
+            old.cancel()
+        t = threading.Timer(max(exp - self.margin - 30 - time.time(), 1), self._refresh, args=(acc,))
+        t.daemon = True
+        self._timers[aid] = t
+        t.start()
+
+    def _refresh(self, acc):
+        with self._acc_lock(acc["accountId"]):
+            self._grant(acc)
+
+    def invalidate(self, account_id):
+        """Drop a token the server rejected so the next ``get`` grants a new one."""
+        self._tokens.pop(account_id, None)
+        t = self._timers.pop(account_id, None)
+        if t:
+            t.cancel()
+
+    def summary(self):
+        return f"Token grants: {self.grants} | reused: {self.reused} (round-trips avoided)"
@@ -0,0 +1,133 @@
+"""Non-interactive batch gifting: many (recipient, item) jobs from a JSONL or CSV file.
+
+    python -m giftbot batch jobs.jsonl -o results.jsonl
+
+Each job line is ``{"recipient": "...", "item": "<slug, name or offerId>"}``
+(``offerId`` is accepted in place of ``item``); CSV files use the same
+column names, or just two columns in that order. Results are appended to
+the output file as each job finishes, and re-running with the same output
+file skips jobs that were already sent or skipped (a job every bot was
+throttled on is retried).
+"""
+
+import csv, json, os, sys, time
+
+from .auth import TokenManager
+from .gifting import SENT, SKIPPED, gift_entry
+from .pacing import key, pacer
+from .resolve import resolver
+from .scheduler import BotScheduler
+from .shop import entry_name, load_shop
+
+DONE = (SENT, SKIPPED)
+
+
+def read_jobs(path, warn=None):
+    """Jobs from a JSONL or CSV file; lines that are not a usable job are reported through ``warn`` and skipped."""
+    warn = warn or (lambda msg: print(msg, file=sys.stderr))
+    jobs, rows = [], []
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            reader = csv.reader(f)
+            lines = [(reader.line_num, r) for r in reader if any(c.strip() for c in r)]
+            if lines and [c.strip().lower() for c in lines[0][1]][:1] == ["recipient"]:
+                head = [c.strip().lower() for c in lines.pop(0)[1]]
+                rows = [(n, dict(zip(head, r))) for n, r in lines]
+            else:
+                rows = [(n, {"recipient": r[0], "item": r[1] if len(r) > 1 else ""}) for n, r in lines]
+        else:
+            for n, ln in enumerate(f, 1):
+                if not ln.strip():
+                    continue
+                try:
+                    r = json.loads(ln)
+                except ValueError:
+                    warn(f"{path}:{n}: not valid JSON, skipped")
+                    continue
+                if not isinstance(r, dict):
+                    warn(f"{path}:{n}: expected a JSON object, skipped")
+                    continue
+                rows.append((n, r))
+    for n, r in rows:
+        rec, item = str(r.get("recipient") or "").strip(), str(r.get("item") or r.get("offerId") or "").strip()
+        if rec and item:
+            jobs.append({"recipient": rec, "item": item})
+        else:
+            warn(f"{path}:{n}: missing recipient or item, skipped")
+    return jobs
+
+
+def job_key(job):
+    return job["recipient"].lower(), job["item"].lower()
+
+
+def finished_jobs(path):
+    """Keys of jobs already sent or skipped in a previous run's output file."""
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for ln in f:
+            try:
+                r = json.loads(ln)
+            except ValueError:
+                continue
+            if r.get("status") in DONE:
+                done.add(job_key(r))
+    return done
+
+
+class BatchRun:
+    """Resolves every recipient and item up front, then gifts job by job with bot rotation."""
+
+    def __init__(self, accs, out_path, tokens=None, pacing=0.0, log=print, scheduler=None):
+        self.accs = accs
+        self.out_path = out_path
+        self.tokens = tokens or TokenManager()
+        self.scheduler = scheduler or BotScheduler(accs, self.tokens)
+        self.pacing = pacing
+        self.log = log
+        self.counts = {}
+
+    def resolve(self, jobs):
+        shop = load_shop()
+        recipients = resolver.resolve_many([j["recipient"] for j in jobs], self.tokens, self.accs)
+        self.log(f"Resolved {len(recipients)} recipients ({resolver.hits} cache hits, {resolver.lookups} lookups)")
+        items = {}
+        for j in jobs:
+            if j["item"].lower() not in items:
+                items[j["item"].lower()] = shop.find(j["item"])
+        return recipients, items
+
+    def run(self, jobs):
+        done = finished_jobs(self.out_path)
+        todo = [j for j in jobs if job_key(j) not in done]
+        self.log(f"{len(jobs)} jobs, {len(jobs) - len(todo)} already finished, {len(todo)} to run")
+        recipients, items = self.resolve(todo)
+        for a in self.accs:
+            pacer.set_floor(key("gift", a["accountId"]), a.get("pacing", self.pacing))
+        with open(self.out_path, "a", encoding="utf-8") as out:
+            for n, j in enumerate(todo, 1):
+                rid, entry = recipients.get(j["recipient"].lower()), items.get(j["item"].lower())
+                rec = {"recipient": j["recipient"], "item": j["item"], "recipientId": rid,
+                       "offerId": entry.get("offerId") if entry else None, "bot": None, "ts": time.time()}
+                if not rid:
+                    rec["status"] = "unresolved_recipient"
+                elif not entry:
+                    rec["status"] = "item_not_found"
+                else:
+                    outcome, bot = gift_entry(entry, rid, self.tokens, self.scheduler)
+                    rec.update(status=outcome, bot=bot["accountId"] if bot else None, ts=time.time())
+                self.counts[rec["status"]] = self.counts.get(rec["status"], 0) + 1
+                out.write(json.dumps(rec) + "\n")
+                out.flush()
+                self.log(f"[{n}/{len(todo)}] {j['recipient']} <- {entry_name(entry) if entry else j['item']}: {rec['status']}")
+                if not self.scheduler.pick(0):
+                    self.log("No bot has gifts left today. Stopping; re-run to resume.")
+                    break
+        return self.counts
+
+
+if __name__ == "__main__":
+    from .cli import main
+    sys.exit(main(["batch", *sys.argv[1:]]))
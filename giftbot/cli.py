@@ -0,0 +1,391 @@
+"""Headless command line; with no subcommand the interactive panel starts.
+
+    python -m giftbot gift <item | shop URL | offerId> <recipient> [--json]
+    python -m giftbot gift-shop <recipient> [--order price|rarity] [--budget VB] [--dry-run] [--workers N] [--pacing S] [--json]
+    python -m giftbot accounts list|check [--sort KEY] [--json]
+    python -m giftbot exchange <index | accountId | displayName> [--json]
+    python -m giftbot batch <jobs.jsonl|csv> [-o results.jsonl]
+    python -m giftbot queue add <jobs.jsonl|csv> | add-shop <recipient> | status | retry
+    python -m giftbot worker [-n N]
+
+Subcommands import only what they use; colorama, fade and webbrowser are
+loaded by the panel alone. Exit codes are listed in ``EXIT_CODES``.
+"""
+
+import argparse, json, sys
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_NO_ACCOUNTS = 3
+EXIT_NOT_FOUND = 4
+EXIT_AUTH = 5
+
+EXIT_CODES = {
+    EXIT_OK: "success (sent or skipped because the recipient owns it)",
+    EXIT_FAILED: "one or more gifts or checks failed",
+    EXIT_USAGE: "bad arguments",
+    EXIT_NO_ACCOUNTS: "no bot accounts linked",
+    EXIT_NOT_FOUND: "item or recipient not found",
+    EXIT_AUTH: "device auth rejected",
+}
+
+
+def _store(args):
+    from .accounts import AccountStore, store
+    return store if args.config == store.path else AccountStore(args.config)
+
+
+def _accounts(args):
+    accs = _store(args).all()
+    if not accs:
+        print("No bot accounts linked. Add accounts first.", file=sys.stderr)
+    return accs
+
+
+def _emit(args, data, text):
+    print(json.dumps(data) if args.json else text)
+
+
+def _jobs(args):
+    """Jobs from ``args.jobs``, or None (after saying why) when the file cannot be read."""
+    from .batch import read_jobs
+    try:
+        return read_jobs(args.jobs)
+    except (OSError, ValueError) as e:
+        print(f"Cannot read job file {args.jobs}: {e}", file=sys.stderr)
+        return None
+
+
+def _csv(value):
+    return [v.strip().lower() for v in value.split(",") if v.strip()] if value else None
+
+
+def _plan(args):
+    from .plan import plan_gifts
+    from .shop import load_shop
+    return plan_gifts(load_shop(force=args.refresh_shop).entries, order=args.order, budget=args.budget, max_price=args.max_price,
+                      types=_csv(args.types), skip_types=_csv(args.skip_types))
+
+
+def cmd_gift(args):
+    from .auth import TokenManager
+    from .gifting import SENT, SKIPPED, gift_entry
+    from .resolve import resolve_recipient
+    from .scheduler import BotScheduler
+    from .shop import entry_name, entry_price, load_shop, slug_from_url
+
+    accs = _accounts(args)
+    if not accs:
+        return EXIT_NO_ACCOUNTS
+    entry = load_shop(force=args.refresh_shop).find(slug_from_url(args.item) or args.item)
+    if not entry:
+        print(f"Item not found in shop: {args.item}", file=sys.stderr)
+        return EXIT_NOT_FOUND
+    tokens = TokenManager(background=False)
+    rid = resolve_recipient(args.recipient, tokens, accs)
+    if not rid:
+        print(f"Could not resolve {args.recipient} to an account ID", file=sys.stderr)
+        return EXIT_NOT_FOUND
+    outcome, bot = gift_entry(entry, rid, tokens, BotScheduler(accs, tokens))
+    _emit(args, {"item": entry_name(entry), "offerId": entry.get("offerId"), "price": entry_price(entry), "recipient": args.recipient,
+                 "recipientId": rid, "status": outcome, "bot": bot["accountId"] if bot else None},
+          f"{entry_name(entry)} ({entry_price(entry)} VB) -> {args.recipient}: {outcome}")
+    return EXIT_OK if outcome in (SENT, SKIPPED) else EXIT_FAILED
+
+
+def cmd_gift_shop(args):
+    from .auth import TokenManager
+    from .gifting import SENT, SKIPPED, ShopGifter
+    from .resolve import resolve_recipient
+    from .scheduler import BotScheduler
+    from .shop import entry_name, entry_price
+
+    accs = _accounts(args)
+    if not accs:
+        return EXIT_NO_ACCOUNTS
+    plan = _plan(args)
+    if args.dry_run:
+        _emit(args, {"recipient": args.recipient, "plan": plan.to_dict()}, "\n".join(plan.lines()))
+        return EXIT_OK
+    if not args.json:
+        print("\n".join(plan.lines()), flush=True)
+    tokens = TokenManager(background=False)
+    rid = resolve_recipient(args.recipient, tokens, accs)
+    if not rid:
+        print(f"Could not resolve {args.recipient} to an account ID", file=sys.stderr)
+        return EXIT_NOT_FOUND
+
+    def report(entry, bot, outcome):
+        if not args.json:
+            print(f"{entry_name(entry)} ({entry_price(entry)} VB) - {(bot or {}).get('displayName') or (bot or {}).get('accountId', '-')}: {outcome}", flush=True)
+
+    engine = ShopGifter(accs[:args.workers] if args.workers else accs, tokens, rid, default_pacing=args.pacing,
+                        on_result=report, scheduler=BotScheduler(accs, tokens))
+    results = engine.run(plan.entries)
+    counts = {s: sum(1 for _, _, o in results if o == s) for s in {o for _, _, o in results}}
+    if args.json:
+        print(json.dumps({"recipient": args.recipient, "recipientId": rid, "elapsed": round(engine.elapsed, 3), "counts": counts, "plan": plan.to_dict(),
+                          "results": [{"offerId": e.get("offerId"), "item": entry_name(e), "bot": b["accountId"] if b else None, "status": o} for e, b, o in results]}))
+    else:
+        print("\n".join(engine.summary()))
+    return EXIT_OK if all(o in (SENT, SKIPPED) for _, _, o in results) else EXIT_FAILED
+
+
+def cmd_accounts_list(args):
+    accs = _store(args).all()
+    rows = [{"accountId": a["accountId"], "displayName": a.get("displayName"), "email": a.get("email")} for a in accs]
+    _emit(args, rows, "\n".join(f"[{i}] {r['displayName'] or '?'} ({r['accountId']})" for i, r in enumerate(rows)) or "No accounts")
+    return EXIT_OK
+
+
+def cmd_accounts_check(args):
+    import time
+    from .health import OK, DEAD, check_all, table
+
+    accs = _accounts(args)
+    if not accs:
+        return EXIT_NO_ACCOUNTS
+    t0 = time.monotonic()
+    results = check_all(accs, workers=args.workers, store=_store(args), sort=args.sort)
+    for r in results:
+        r.pop("profile", None)
+    elapsed = time.monotonic() - t0
+    if args.json:
+        print(json.dumps({"checkedAt": time.time(), "elapsed": round(elapsed, 3), "accounts": results}, indent=2))
+    else:
+        print("\n".join(table(results)))
+        print(f"\n{sum(r['status'] == OK for r in results)}/{len(results)} ok in {elapsed:.1f}s")
+    if any(r["status"] == DEAD for r in results):
+        return EXIT_AUTH
+    return EXIT_OK if all(r["status"] == OK for r in results) else EXIT_FAILED
+
+
+def cmd_exchange(args):
+    import requests
+    from .auth import TokenManager, exchange_code
+
+    accs = _accounts(args)
+    if not accs:
+        return EXIT_NO_ACCOUNTS
+    key = args.account.lower()
+    acc = accs[int(key)] if key.isdigit() and int(key) < len(accs) else next(
+        (a for a in accs if key in (a["accountId"].lower(), (a.get("displayName") or "").lower())), None)
+    if not acc:
+        print(f"No linked account matches {args.account}", file=sys.stderr)
+        return EXIT_NOT_FOUND
+    tokens = TokenManager(background=False)
+    tok = tokens.get(acc)
+    if not tok:
+        err = tokens.errors.get(acc["accountId"]) or "no token"
+        if err.startswith("network"):
+            print(f"Could not reach Epic ({err})", file=sys.stderr)
+            return EXIT_FAILED
+        print(f"Invalid device auth ({err})", file=sys.stderr)
+        return EXIT_AUTH
+    try:
+        code = exchange_code(tok)
+    except requests.RequestException as e:
+        print(f"Could not reach Epic (network: {type(e).__name__})", file=sys.stderr)
+        return EXIT_FAILED
+    if not code:
+        print("Failed to get exchange code", file=sys.stderr)
+        return EXIT_FAILED
+    link = f"https://www.epicgames.com/id/exchange?exchangeCode={code}"
+    _emit(args, {"accountId": acc["accountId"], "code": code, "link": link}, f"Exchange code: {code}\nLogin link: {link}")
+    return EXIT_OK
+
+
+def cmd_batch(args):
+    from .batch import DONE, BatchRun
+
+    jobs = _jobs(args)
+    if jobs is None:
+        return EXIT_USAGE
+    accs = _accounts(args)
+    if not accs:
+        return EXIT_NO_ACCOUNTS
+    counts = BatchRun(accs, args.output, pacing=args.pacing).run(jobs)
+    print(" | ".join(f"{k}: {v}" for k, v in sorted(counts.items())) or "Nothing to do")
+    return EXIT_OK if all(k in DONE for k in counts) else EXIT_FAILED
+
+
+def cmd_queue_add(args):
+    from .auth import TokenManager
+    from .jobqueue import JobQueue
+    from .resolve import resolver
+    from .shop import entry_name, entry_price, load_shop
+
+    jobs = _jobs(args)
+    if jobs is None:
+        return EXIT_USAGE
+    accs = _accounts(args)
+    if not accs:
+        return EXIT_NO_ACCOUNTS
+    ids = resolver.resolve_many([j["recipient"] for j in jobs], TokenManager(background=False), accs)
+    shop, rows, missing = load_shop(), [], 0
+    for j in jobs:
+        rid, entry = ids.get(j["recipient"].lower()), shop.find(j["item"])
+        if not rid or not entry:
+            missing += 1
+            print(f"{j['recipient']} <- {j['item']}: {'item not found' if rid else 'unresolved recipient'}", file=sys.stderr)
+            continue
+        rows.append((j["recipient"], rid, entry["offerId"], entry_name(entry), entry_price(entry)))
+    added = JobQueue(args.db).add(rows)
+    print(f"Queued {added} new jobs ({len(rows) - added} already queued, {missing} not queued)")
+    return EXIT_OK if not missing else EXIT_NOT_FOUND
+
+
+def cmd_queue_add_shop(args):
+    from .auth import TokenManager
+    from .jobqueue import JobQueue
+    from .resolve import resolve_recipient
+    from .shop import entry_name, entry_price
+
+    accs = _accounts(args)
+    if not accs:
+        return EXIT_NO_ACCOUNTS
+    rid = resolve_recipient(args.recipient, TokenManager(background=False), accs)
+    if not rid:
+        print(f"Could not resolve {args.recipient} to an account ID", file=sys.stderr)
+        return EXIT_NOT_FOUND
+    plan = _plan(args)
+    print("\n".join(plan.lines()))
+    added = JobQueue(args.db).add([(args.recipient, rid, e["offerId"], entry_name(e), entry_price(e)) for e in plan.entries])
+    print(f"Queued {added} new jobs ({len(plan.entries) - added} already queued)")
+    return EXIT_OK
+
+
+def cmd_queue_status(args):
+    from .jobqueue import FAILED, JobQueue
+
+    q = JobQueue(args.db)
+    counts, failed = q.counts(), q.failed()
+    if args.json:
+        print(json.dumps({"counts": counts, "failed": failed}))
+    else:
+        print(" | ".join(f"{k}: {v}" for k, v in counts.items()))
+        for j in failed:
+            print(f"  {FAILED}: {j['recipient']} <- {j['item'] or j['offer_id']} ({j['error'] or '-'}, {j['attempts']} attempts)")
+    return EXIT_OK
+
+
+def cmd_queue_retry(args):
+    from .jobqueue import FAILED, IN_FLIGHT, JobQueue
+
+    n = JobQueue(args.db).requeue((FAILED, IN_FLIGHT) if args.in_flight else (FAILED,))
+    print(f"Requeued {n} jobs")
+    return EXIT_OK
+
+
+def cmd_worker(args):
+    from .jobqueue import PENDING, IN_FLIGHT, FAILED, JobQueue, run_workers
+
+    accs = _accounts(args)
+    if not accs:
+        return EXIT_NO_ACCOUNTS
+    run_workers(args.db, accs, args.workers, args.pacing)
+    counts = JobQueue(args.db).counts()
+    print(" | ".join(f"{k}: {v}" for k, v in counts.items()))
+    return EXIT_FAILED if counts[FAILED] or counts[PENDING] or counts[IN_FLIGHT] else EXIT_OK
+
+
+def _plan_args(p):
+    p.add_argument("--order", choices=("shop", "price", "price-desc", "rarity"), default="shop", help="gift order: shop, price (cheapest first), price-desc or rarity (default: %(default)s)")
+    p.add_argument("--budget", type=int, metavar="VB", help="stop planning once the total reaches this many V-Bucks")
+    p.add_argument("--max-price", type=int, metavar="VB", help="skip entries costing more than this")
+    p.add_argument("--types", metavar="T,T", help="only entries containing these item types (outfit,emote,...)")
+    p.add_argument("--skip-types", metavar="T,T", help="skip entries made only of these item types")
+    p.add_argument("--refresh-shop", action="store_true", help="ignore the cached shop snapshot")
+
+
+def parser():
+    ap = argparse.ArgumentParser(prog="giftbot", description="Fortnite gift bot. Run without a command for the interactive panel.",
+                                 epilog="exit codes: " + "; ".join(f"{k} {v}" for k, v in EXIT_CODES.items()))
+    ap.add_argument("-c", "--config", default="config.json", help="bot accounts file (default: %(default)s)")
+    ap.add_argument("--metrics", metavar="FILE", help="append per-request / per-gift events to FILE (JSONL) and print a run summary")
+    sub = ap.add_subparsers(dest="command", metavar="command")
+
+    p = sub.add_parser("gift", help="gift one shop item to one recipient")
+    p.add_argument("item", help="item name, fortnite.com item-shop URL or offerId")
+    p.add_argument("recipient", help="displayName or accountId")
+    p.add_argument("--refresh-shop", action="store_true", help="ignore the cached shop snapshot")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_gift)
+
+    p = sub.add_parser("gift-shop", help="gift every giftable shop entry to one recipient")
+    p.add_argument("recipient", help="displayName or accountId")
+    p.add_argument("--workers", type=int, default=0, help="bots gifting in parallel (default: all)")
+    p.add_argument("--pacing", type=float, default=0.0, help="minimum seconds between one bot's gifts unless set in config.json; throttled bots slow down on their own (default: %(default)s)")
+    _plan_args(p)
+    p.add_argument("--dry-run", action="store_true", help="print the plan and exit without gifting")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_gift_shop)
+
+    p = sub.add_parser("accounts", help="list or health-check linked bots")
+    acc = p.add_subparsers(dest="action", metavar="action", required=True)
+    q = acc.add_parser("list", help="linked bots from the account store")
+    q.add_argument("--json", action="store_true")
+    q.set_defaults(func=cmd_accounts_list)
+    q = acc.add_parser("check", help="verify every device auth in parallel")
+    q.add_argument("--workers", type=int, default=8, help="bots checked at once (default: %(default)s)")
+    q.add_argument("--sort", choices=("latency", "name", "status", "vbucks"), default="name")
+    q.add_argument("--json", action="store_true", help="machine-readable output for scheduled runs")
+    q.set_defaults(func=cmd_accounts_check)
+
+    p = sub.add_parser("exchange", help="generate an exchange code / login link for a bot")
+    p.add_argument("account", help="index, accountId or displayName of a linked bot")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_exchange)
+
+    p = sub.add_parser("batch", help="gift many items to many recipients from a job file")
+    p.add_argument("jobs", help="JSONL or CSV file of recipient/item jobs")
+    p.add_argument("-o", "--output", default="batch_results.jsonl", help="results file, also used to resume (default: %(default)s)")
+    p.add_argument("--pacing", type=float, default=0.0, help="minimum seconds between one bot's gifts; throttled bots slow down on their own (default: %(default)s)")
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser("queue", help="durable gift job queue for long campaigns (see worker)")
+    p.add_argument("--db", default="gift_queue.db", help="queue database (default: %(default)s)")
+    qa = p.add_subparsers(dest="action", metavar="action", required=True)
+    q = qa.add_parser("add", help="queue recipient/item jobs from a JSONL or CSV file")
+    q.add_argument("jobs", help="JSONL or CSV file of recipient/item jobs")
+    q.set_defaults(func=cmd_queue_add)
+    q = qa.add_parser("add-shop", help="queue the planned shop for one recipient")
+    q.add_argument("recipient", help="displayName or accountId")
+    _plan_args(q)
+    q.set_defaults(func=cmd_queue_add_shop)
+    q = qa.add_parser("status", help="jobs per state and recent failures")
+    q.add_argument("--json", action="store_true")
+    q.set_defaults(func=cmd_queue_status)
+    q = qa.add_parser("retry", help="move failed jobs back to pending")
+    q.add_argument("--in-flight", action="store_true", help="also requeue in_flight jobs (only when no worker is running)")
+    q.set_defaults(func=cmd_queue_retry)
+
+    p = sub.add_parser("worker", help="drain the job queue with worker processes sharing the bot pool")
+    p.add_argument("--db", default="gift_queue.db", help="queue database (default: %(default)s)")
+    p.add_argument("-n", "--workers", type=int, default=1, help="worker processes, each with its own share of the bots (default: %(default)s)")
+    p.add_argument("--pacing", type=float, default=0.0, help="minimum seconds between one bot's gifts (default: %(default)s)")
+    p.set_defaults(func=cmd_worker)
+    return ap
+
+
+def main(argv=None):
+    args = parser().parse_args(argv)
+    if args.metrics:
+        from .metrics import metrics
+        metrics.open(args.metrics)
+    try:
+        if not args.command:
+            from .tui import run
+            run(_store(args))
+            return EXIT_OK
+        return args.func(args)
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if args.metrics:
+            from .metrics import bot_label
+            from .pacing import pacer
+            labels = {a["accountId"]: bot_label(a) for a in _store(args).all()}
+            print("\n".join(metrics.summary() + pacer.summary(labels)), file=sys.stderr)
+            metrics.close()
@@ -0,0 +1,93 @@
+"""Shared HTTP layer: one keep-alive session per host, timeouts and retry with backoff.
+
+Every Epic and fortnite-api call goes through ``client`` so bulk runs reuse
+TCP+TLS connections instead of handshaking on each request.
+"""
+
+import threading, time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .metrics import category, current, error_code, metrics
+from .pacing import is_throttled, key, pacer, retry_after
+
+IDEMPOTENT = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class Client:
+    def __init__(self, timeout=10, retries=3, backoff=0.5, pool_size=32, max_throttle_wait=30.0):
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_throttle_wait = max_throttle_wait
+        self.pool_size = pool_size
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def session(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            s = self._sessions.get(host)
+            if s is None:
+                s = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.headers["Connection"] = "keep-alive"
+                self._sessions[host] = s
+            return s
+
+    def request(self, method, url, idempotent=None, retries=None, timeout=None, retry_throttled=True, **kw):
+        """Send a request, retrying connection errors and (when idempotent) 5xx responses.
+
+        Non-idempotent calls such as GiftCatalogEntry are only retried when the
+        connection could not be opened, so a gift is never sent twice. Throttled
+        responses were never processed, so any call is retried once its pacing
+        key (endpoint, or endpoint for the current bot) may send again, unless
+        the server asks for more than ``max_throttle_wait`` seconds. With
+        ``retry_throttled=False`` the throttle is only recorded with the pacer
+        and the response returned, so the caller can move on to another bot.
+        """
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT
+        retries = self.retries if retries is None else retries
+        s = self.session(url)
+        k = key(category(urlsplit(url).path), current().get("accountId"))
+        for attempt in range(retries + 1):
+            pacer.wait(k)
+            t0 = time.perf_counter()
+            try:
+                r = s.request(method, url, timeout=timeout or self.timeout, **kw)
+            except requests.RequestException as e:
+                metrics.http_event(method, url, 0, time.perf_counter() - t0, f"network: {type(e).__name__}", attempt)
+                if attempt == retries or not isinstance(e, requests.ConnectionError) or not (idempotent or isinstance(e, requests.ConnectTimeout)):
+                    raise
+                delay = None
+            else:
+                metrics.http_event(method, url, r.status_code, time.perf_counter() - t0, error_code(r), attempt)
+                if is_throttled(r):
+                    if pacer.throttled(k, retry_after(r)) > self.max_throttle_wait or not retry_throttled or attempt == retries:
+                        return r
+                    continue
+                pacer.ok(k)
+                if r.status_code < 500 or not idempotent or attempt == retries:
+                    return r
+                delay = retry_after(r)
+            time.sleep(self.backoff * 2 ** attempt if delay is None else min(delay, self.max_throttle_wait))
+
+    def get(self, url, **kw):
+        return self.request("GET", url, **kw)
+
+    def post(self, url, **kw):
+        return self.request("POST", url, **kw)
+
+    def close(self):
+        with self._lock:
+            for s in self._sessions.values():
+                s.close()
+            self._sessions.clear()
+
+
+client = Client()
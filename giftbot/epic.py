@@ -0,0 +1,23 @@
+"""Epic / fortnite-api endpoints and client credentials used by the bot."""
+
+import base64, os
+
+# GIFTBOT_API_BASE points every host at one server, e.g. the local mock in bench/
+_BASE = os.environ.get("GIFTBOT_API_BASE", "").rstrip("/")
+
+ACCOUNT = (_BASE or "https://account-public-service-prod.ol.epicgames.com") + "/account/api"
+MCP = (_BASE or "https://fngw-mcp-gc-livefn.ol.epicgames.com") + "/fortnite/api/game/v2"
+SHOP_URL = (_BASE or "https://fortnite-api.com") + "/v2/shop"
+
+TOKEN_URL = ACCOUNT + "/oauth/token"
+
+# fortniteNewSwitchGameClient, used for the client_credentials / device_code flow
+SWITCH_AUTH = "Basic OThmN2U0MmMyZTNhNGY4NmE3NGViNDNmYmI0MWVkMzk6MGEyNDQ5YTItMDAxYS00NTFlLWFmZWMtM2U4MTI5MDFjNGQ3"
+# fortniteIOSGameClient, owner of the device auths stored in config.json
+IOS_AUTH = "Basic M2Y2OWU1NmM3NjQ5NDkyYzhjYzI5ZjFhZjA4YThhMTI6YjUxZWU5Y2IxMjIzNGY1MGE2OWVmYTY3ZWY1MzgxMmU="
+
+
+def device_auth_form(acc):
+    """Form body for a grant_type=device_auth token request from a config.json entry."""
+    return {"grant_type": "device_auth", "device_id": base64.b64decode(acc["deviceId"]).decode(),
+            "account_id": acc["accountId"], "secret": base64.b64decode(acc["secret"]).decode()}
@@ -0,0 +1,247 @@
+"""GiftCatalogEntry calls and a concurrent engine that gifts through several bots at once."""
+
+import queue, threading, time
+
+import requests
+
+from .client import client
+from .epic import MCP
+from .metrics import bot_context, error_code, metrics
+from .pacing import is_throttled, key, pacer
+from .shop import entry_price
+
+SENT, SKIPPED, FAILED, RETRY, THROTTLED = "sent", "skipped", "failed", "retry", "throttled"
+
+SKIP_MARKERS = ("user already owns", "all items in this bundle are already owned", "invalid_parameter", "receiver_owns_item")
+
+
+def send_gift(bot, token, offer_id, price, recipient_id, timeout=5):
+    return client.post(f"{MCP}/profile/{bot['accountId']}/client/GiftCatalogEntry?profileId=common_core",
+        json={"offerId": offer_id, "currency": "MtxCurrency", "currencySubType": "", "expectedTotalPrice": price, "gameContext": "Frontend.CatabaScreen", "receiverAccountIds": [recipient_id], "giftWrapTemplateId": "", "personalMessage": ""},
+        headers={"Authorization": "Bearer " + token}, timeout=timeout, retry_throttled=False)
+
+
+def classify(r):
+    """SENT, SKIPPED (recipient owns / not giftable), RETRY (stale token), THROTTLED or FAILED (bot limit / V-Bucks)."""
+    txt = (r.text or "").lower()
+    if r.status_code == 200 and "profilechanges" in txt and "errors.com.epicgames" not in txt:
+        return SENT
+    if is_throttled(r):
+        return THROTTLED
+    if any(m in txt for m in SKIP_MARKERS):
+        return SKIPPED
+    if r.status_code == 401:
+        return RETRY
+    return FAILED
+
+
+def gift_once(bot, tokens, offer_id, price, recipient_id, scheduler=None):
+    """Gift with one bot, re-granting the token once if the cached one was rejected.
+
+    With a ``scheduler`` the bot's balance and gift count are updated from the response.
+    """
+    t0 = time.perf_counter()
+    with bot_context(bot, offerId=offer_id):
+        outcome, r, code = _attempt(bot, tokens, offer_id, price, recipient_id)
+    metrics.gift_event(bot, offer_id, recipient_id, outcome, time.perf_counter() - t0, code)
+    if scheduler:
+        if outcome == SENT:
+            try:
+                body = r.json()
+            except ValueError:
+                body = {}
+            scheduler.record(bot, price, body)
+        elif outcome == FAILED:
+            scheduler.failed(bot)
+    return outcome
+
+
+def _attempt(bot, tokens, offer_id, price, recipient_id):
+    r = None
+    for _ in range(2):
+        tok = tokens.get(bot)
+        if not tok:
+            return FAILED, None, tokens.errors.get(bot["accountId"]) or "no token"
+        try:
+            r = send_gift(bot, tok, offer_id, price, recipient_id)
+        except requests.RequestException as e:
+            return FAILED, None, f"network: {type(e).__name__}"
+        outcome = classify(r)
+        if outcome != RETRY:
+            return outcome, r, error_code(r)
+        tokens.invalidate(bot["accountId"])
+    return FAILED, r, error_code(r)
+
+
+def gift_entry(entry, recipient_id, tokens, scheduler, on_attempt=None, rounds=3):
+    """Gift one shop entry with whichever bots can pay for it, in scheduler order.
+
+    Returns ``(outcome, bot)``; ``bot`` is None when no bot could even try.
+    A bot that is throttled is skipped for this entry but not marked failed.
+    Once every bot is used up and some were only throttled, they are tried
+    again, soonest free first, up to ``rounds`` more times and only while the
+    wait stays under the client's ``max_throttle_wait``.
+    ``on_attempt(bot)`` is called before each bot is tried.
+    """
+    price, tried, throttled, outcome, bot = entry_price(entry), set(), set(), FAILED, None
+    while True:
+        nxt = scheduler.pick(price, exclude=tried)
+        if not nxt and throttled and rounds:
+            tried -= throttled
+            throttled.clear()
+            rounds -= 1
+            nxt = scheduler.pick(price, exclude=tried)
+            if nxt and pacer.delay(key("gift", nxt["accountId"])) > client.max_throttle_wait:
+                nxt = None
+        if not nxt:
+            return outcome, bot
+        bot = nxt
+        tried.add(bot["accountId"])
+        if on_attempt:
+            on_attempt(bot)
+        outcome = gift_once(bot, tokens, entry.get("offerId"), price, recipient_id, scheduler)
+        if outcome in (SENT, SKIPPED):
+            return outcome, bot
+        if outcome == THROTTLED:
+            throttled.add(bot["accountId"])
+
+
+class BotStats:
+    def __init__(self, bot):
+        self.bot = bot
+        self.sent = 0
+        self.skipped = 0
+        self.failed = 0
+        self.throttled = 0
+        self.busy = 0.0
+        self.retired = False
+
+    @property
+    def name(self):
+        return self.bot.get("displayName") or self.bot["accountId"][:12]
+
+    def per_minute(self, elapsed):
+        return (self.sent + self.skipped) * 60 / elapsed if elapsed else 0.0
+
+
+class ShopGifter:
+    """Hands shop entries to a pool of bots, one worker thread per bot.
+
+    Bots gift as fast as Epic accepts: a throttled bot is held off for the
+    time the server asks (see ``giftbot.pacing``) and its entry goes back to
+    the queue for the others. ``"pacing"`` in config.json, else
+    ``default_pacing``, sets a minimum gap between one bot's gifts. With a
+    ``scheduler`` a bot passes on entries it cannot pay for without sending
+    anything; a bot that fails a gift is retired. Either way the entry goes
+    back to the queue for the bots that have not tried it, and fails once
+    every remaining bot has.
+    """
+
+    def __init__(self, bots, tokens, recipient_id, default_pacing=0.0, on_result=None, scheduler=None):
+        self.bots = bots
+        self.tokens = tokens
+        self.recipient_id = recipient_id
+        self.default_pacing = default_pacing
+        self.on_result = on_result
+        self.scheduler = scheduler
+        self.stats = [BotStats(b) for b in bots]
+        self.results = []
+        self.elapsed = 0.0
+        self._q = queue.Queue()
+        self._lock = threading.Lock()
+        self._pending = 0
+
+    def _pacing(self, bot):
+        p = bot.get("pacing")
+        return self.default_pacing if p is None else float(p)
+
+    def _alive(self):
+        return [s for s in self.stats if not s.retired]
+
+    def _finish(self, entry, st, outcome):
+        with self._lock:
+            self._pending -= 1
+            self.results.append((entry, st.bot if st else None, outcome))
+            if self.on_result:
+                self.on_result(entry, st.bot if st else None, outcome)
+
+    def _worker(self, st):
+        aid = st.bot["accountId"]
+        k = key("gift", aid)
+        pacer.set_floor(k, self._pacing(st.bot))
+        while not st.retired:
+            with self._lock:
+                if self._pending <= 0:
+                    return
+            wait = pacer.delay(k)
+            if wait:
+                time.sleep(min(wait, 0.2))
+                continue
+            try:
+                entry, tried = self._q.get(timeout=0.2)
+            except queue.Empty:
+                continue
+            with self._lock:
+                exhausted = all(s.bot["accountId"] in tried for s in self._alive())
+            if exhausted:
+                self._finish(entry, None, FAILED)
+                continue
+            if aid in tried:
+                self._q.put((entry, tried))
+                time.sleep(0.05)
+                continue
+            price = entry_price(entry)
+            if self.scheduler and not self.scheduler.can_pay(st.bot, price):
+                self._q.put((entry, tried | {aid}))
+                continue
+            t0 = time.monotonic()
+            outcome = gift_once(st.bot, self.tokens, entry.get("offerId"), price, self.recipient_id, self.scheduler)
+            st.busy += time.monotonic() - t0
+            if outcome == THROTTLED:
+                st.throttled += 1
+                self._q.put((entry, tried))
+                continue
+            if outcome == SENT:
+                st.sent += 1
+            elif outcome == SKIPPED:
+                st.skipped += 1
+            else:
+                st.failed += 1
+                with self._lock:
+                    st.retired = True
+                self._q.put((entry, tried | {aid}))
+                self._drain_if_dead()
+                return
+            self._finish(entry, st, outcome)
+
+    def _drain_if_dead(self):
+        if self._alive():
+            return
+        while True:
+            try:
+                entry, _ = self._q.get_nowait()
+            except queue.Empty:
+                return
+            self._finish(entry, None, FAILED)
+
+    def run(self, entries):
+        start = time.monotonic()
+        for e in entries:
+            self._q.put((e, frozenset()))
+        self._pending = len(entries)
+        threads = [threading.Thread(target=self._worker, args=(st,), daemon=True) for st in self.stats]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self._drain_if_dead()
+        self.elapsed = time.monotonic() - start
+        return self.results
+
+    def summary(self):
+        lines = []
+        for st in self.stats:
+            lines.append(f"{st.name}: sent {st.sent} | skipped {st.skipped} | failed {st.failed} | {st.per_minute(self.elapsed):.1f} gifts/min"
+                         + (f" | throttled {st.throttled}x" if st.throttled else "") + (" (retired)" if st.retired else ""))
+        lines.append(f"Wall-clock: {self.elapsed:.1f}s")
+        return lines
@@ -0,0 +1,81 @@
+"""Parallel health check of every linked bot.
+
+    python -m giftbot accounts check [--sort vbucks] [--json] [--workers 8]
+
+Each device auth is verified with a fresh grant, then the bot's display
+name (from the account store when cached) and V-Buck balance are read.
+At most ``workers`` bots are checked at a time.
+"""
+
+import sys, time
+from concurrent.futures import ThreadPoolExecutor
+
+from .auth import TokenManager
+from .client import client
+from .epic import ACCOUNT
+from .metrics import bot_context
+from .scheduler import BotState, query_profile
+
+OK, DEAD, ERROR = "ok", "dead", "error"
+SORT_KEYS = {
+    "name": lambda r: (r["displayName"] or "").lower(),
+    "vbucks": lambda r: -(r["vbucks"] if r["vbucks"] is not None else -1),
+    "status": lambda r: (r["status"] != OK, r["status"]),
+    "latency": lambda r: r["latency"],
+}
+
+
+def check_account(acc, tokens, store=None):
+    t0 = time.monotonic()
+    res = {"accountId": acc["accountId"], "displayName": acc.get("displayName"), "email": acc.get("email"),
+           "vbucks": None, "giftsToday": None, "status": OK, "error": None, "latency": 0.0, "profile": None}
+    tok = tokens.get(acc, fresh=True)
+    if not tok:
+        err = tokens.errors.get(acc["accountId"]) or "unknown"
+        res.update(status=ERROR if err.startswith("network") else DEAD, error=err)
+    else:
+        try:
+            if not (res["displayName"] and res["email"]):
+                with bot_context(acc):
+                    r = client.get(f"{ACCOUNT}/public/account/{acc['accountId']}", headers={"Authorization": "Bearer " + tok})
+                if r.status_code == 200:
+                    d = r.json()
+                    res.update(displayName=d.get("displayName") or d.get("name") or "Unknown", email=d.get("email") or "N/A")
+                    if store:
+                        store.update_meta(acc["accountId"], displayName=res["displayName"], email=res["email"])
+            profile = query_profile(acc, tok)
+            if profile:
+                st = BotState()
+                st.load_profile(profile)
+                res.update(vbucks=st.balance, giftsToday=st.gifts_today(), profile=profile)
+            else:
+                res.update(status=ERROR, error="QueryProfile failed")
+        except Exception as e:
+            res.update(status=ERROR, error=f"{type(e).__name__}: {e}")
+    res["latency"] = round(time.monotonic() - t0, 3)
+    return res
+
+
+def check_all(accs, tokens=None, workers=8, store=None, sort="name"):
+    """Check every account with at most ``workers`` in flight; results sorted by ``sort``."""
+    tokens = tokens or TokenManager()
+    if not accs:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        results = list(ex.map(lambda a: check_account(a, tokens, store), accs))
+    return sorted(results, key=SORT_KEYS.get(sort, SORT_KEYS["name"]))
+
+
+def table(results):
+    rows = [("Display name", "V-Bucks", "Gifts 24h", "Status", "Latency", "Account ID")]
+    for r in results:
+        rows.append((r["displayName"] or "?", "-" if r["vbucks"] is None else str(r["vbucks"]),
+                     "-" if r["giftsToday"] is None else str(r["giftsToday"]),
+                     r["status"] + (f" ({r['error']})" if r["error"] else ""), f"{r['latency']:.2f}s", r["accountId"]))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return ["  ".join(c.ljust(w) for c, w in zip(row, widths)).rstrip() for row in rows]
+
+
+if __name__ == "__main__":
+    from .cli import main
+    sys.exit(main(["accounts", "check", *sys.argv[1:]]))
@@ -0,0 +1,211 @@
+"""Durable gift job queue in SQLite, and worker processes that drain it.
+
+    python -m giftbot queue add-shop <recipient> [--order price --budget VB]
+    python -m giftbot queue add jobs.jsonl
+    python -m giftbot worker -n 4
+
+A job is one (recipient accountId, offerId) pair and is only ever queued
+once, so re-adding a campaign is a no-op for jobs it already holds. Jobs move
+pending -> in_flight -> sent / skipped / failed; a job every bot refused is
+retried up to ``MAX_ATTEMPTS`` times before it fails. A worker that dies leaves
+its job in_flight until its lease expires; the job is then handed out again.
+A live worker renews the lease before each bot it tries, and only the worker
+that holds a job can finish or release it.
+If that gift had in fact gone through, Epic answers the second attempt with
+receiver_owns_item and the job ends up skipped, never gifted twice.
+
+Workers are separate processes, each gifting with its own slice of the bot
+pool so no two workers ever spend from the same bot.
+"""
+
+import contextlib, multiprocessing, os, socket, sqlite3, time
+
+from .gifting import FAILED, SENT, SKIPPED, THROTTLED, gift_entry
+from .metrics import bot_label
+from .pacing import key, pacer
+
+DB = "gift_queue.db"
+PENDING, IN_FLIGHT = "pending", "in_flight"
+STATES = (PENDING, IN_FLIGHT, SENT, SKIPPED, FAILED)
+MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    recipient TEXT NOT NULL,
+    recipient_id TEXT NOT NULL,
+    offer_id TEXT NOT NULL,
+    item TEXT,
+    price INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'pending',
+    bot TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_until REAL,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    UNIQUE (recipient_id, offer_id)
+);
+CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, id);
+"""
+
+
+class LeaseLost(Exception):
+    pass
+
+
+class JobQueue:
+    def __init__(self, path=DB, lease=600):
+        self.path = path
+        self.lease = lease
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    @contextlib.contextmanager
+    def _tx(self):
+        """Write transaction that takes the database lock up front, so workers never interleave."""
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.db
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        self.db.execute("COMMIT")
+
+    def add(self, jobs):
+        """Queue ``(recipient, recipient_id, offer_id, item, price)`` tuples; returns how many were new."""
+        now = time.time()
+        with self._tx():
+            cur = self.db.executemany(
+                "INSERT OR IGNORE INTO jobs (recipient, recipient_id, offer_id, item, price, created, updated) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(r, rid, oid, item, price or 0, now, now) for r, rid, oid, item, price in jobs])
+        return cur.rowcount
+
+    def claim(self, worker, max_price=None):
+        """Mark the oldest pending (or lease-expired in_flight) job as ours and return it, or None.
+
+        With ``max_price`` only jobs costing at most that much are handed out; the rest stay pending.
+        """
+        now = time.time()
+        with self._tx():
+            row = self.db.execute("SELECT * FROM jobs WHERE (state = ? OR (state = ? AND lease_until < ?)) AND (? IS NULL OR price <= ?) ORDER BY id LIMIT 1",
+                                  (PENDING, IN_FLIGHT, now, max_price, max_price)).fetchone()
+            if not row:
+                return None
+            job = {**dict(row), "state": IN_FLIGHT, "worker": worker, "lease_until": now + self.lease, "attempts": row["attempts"] + 1, "updated": now}
+            self.db.execute("UPDATE jobs SET state = ?, worker = ?, lease_until = ?, attempts = ?, updated = ? WHERE id = ?",
+                            (IN_FLIGHT, worker, job["lease_until"], job["attempts"], now, job["id"]))
+        return job
+
+    def renew(self, job_id, worker):
+        """Extend ``worker``'s lease on a job; False when the lease expired and the job was handed to someone else."""
+        now = time.time()
+        with self._tx():
+            return self.db.execute("UPDATE jobs SET lease_until = ?, updated = ? WHERE id = ? AND worker = ? AND state = ?",
+                                   (now + self.lease, now, job_id, worker, IN_FLIGHT)).rowcount == 1
+
+    def finish(self, job_id, worker, state, bot=None, error=None):
+        """Record the outcome of a job ``worker`` holds; False when it no longer does."""
+        with self._tx():
+            return self.db.execute("UPDATE jobs SET state = ?, bot = ?, error = ?, worker = NULL, lease_until = NULL, updated = ? WHERE id = ? AND worker = ? AND state = ?",
+                                   (state, bot, error, time.time(), job_id, worker, IN_FLIGHT)).rowcount == 1
+
+    def release(self, job_id, worker, counted=False):
+        """Put a job ``worker`` holds back as pending, by default without counting the attempt against it."""
+        with self._tx():
+            return self.db.execute("UPDATE jobs SET state = ?, attempts = attempts - ?, worker = NULL, lease_until = NULL, updated = ? WHERE id = ? AND worker = ? AND state = ?",
+                                   (PENDING, 0 if counted else 1, time.time(), job_id, worker, IN_FLIGHT)).rowcount == 1
+
+    def requeue(self, states=(FAILED,)):
+        """Move jobs in ``states`` back to pending, e.g. failed ones or in_flight ones left by a crash."""
+        with self._tx():
+            return self.db.execute(f"UPDATE jobs SET state = ?, error = NULL, worker = NULL, lease_until = NULL, updated = ? "
+                                   f"WHERE state IN ({', '.join('?' * len(states))})", (PENDING, time.time(), *states)).rowcount
+
+    def counts(self):
+        counts = dict.fromkeys(STATES, 0)
+        counts.update({r["state"]: r["n"] for r in self.db.execute("SELECT state, COUNT(*) AS n FROM jobs GROUP BY state")})
+        return counts
+
+    def failed(self, limit=20):
+        return [dict(r) for r in self.db.execute("SELECT * FROM jobs WHERE state = ? ORDER BY updated DESC LIMIT ?", (FAILED, limit))]
+
+
+def work(path, accs, worker, pacing=0.0, log=print):
+    """Drain the queue with ``accs`` until no pending job is left that one of them can pay for; returns outcome counts."""
+    from .auth import TokenManager
+    from .scheduler import BotScheduler
+
+    q = JobQueue(path)
+    tokens = TokenManager()
+    scheduler = BotScheduler(accs, tokens)
+    for a in accs:
+        pacer.set_floor(key("gift", a["accountId"]), a.get("pacing", pacing))
+    counts = {}
+    try:
+        while True:
+            budget = scheduler.max_price()
+            if not budget:
+                log(f"[{worker}] No bot has gifts or V-Bucks left today. Stopping; jobs stay queued.")
+                break
+            job = q.claim(worker, budget)
+            if not job:
+                if q.counts()[PENDING]:
+                    log(f"[{worker}] No pending job costs {budget} VB or less. Stopping; jobs stay queued.")
+                break
+            entry = {"offerId": job["offer_id"], "name": job["item"], "finalPrice": job["price"]}
+
+            def renew(bot, job_id=job["id"]):
+                if not q.renew(job_id, worker):
+                    raise LeaseLost(job_id)
+
+            try:
+                outcome, bot = gift_entry(entry, job["recipient_id"], tokens, scheduler, on_attempt=renew)
+            except LeaseLost:
+                log(f"[{worker}] Lease on job {job['id']} expired; left to the worker that took it over.")
+                continue
+            if outcome == THROTTLED:
+                held = q.release(job["id"], worker)
+            elif outcome == FAILED and job["attempts"] < MAX_ATTEMPTS:
+                held = q.release(job["id"], worker, counted=True)
+            else:
+                held = q.finish(job["id"], worker, outcome, bot["accountId"] if bot else None, None if outcome != FAILED else "every bot failed")
+            if not held:
+                log(f"[{worker}] Lease on job {job['id']} expired before it finished; outcome {outcome} not recorded.")
+            counts[outcome] = counts.get(outcome, 0) + 1
+            log(f"[{worker}] {job['recipient']} <- {job['item'] or job['offer_id']}: {outcome}" + (f" ({bot_label(bot)})" if bot else ""))
+    finally:
+        q.close()
+    return counts
+
+
+def _worker_main(path, accs, worker, pacing):
+    try:
+        work(path, accs, worker, pacing, log=lambda line: print(line, flush=True))
+    except KeyboardInterrupt:
+        pass
+
+
+def run_workers(path, accs, n=1, pacing=0.0):
+    """Start ``n`` worker processes, each with its own share of ``accs``, and wait for them."""
+    n = max(1, min(n, len(accs)))
+    if n == 1:
+        work(path, accs, f"{socket.gethostname()}:{os.getpid()}", pacing)
+        return
+    procs = [multiprocessing.Process(target=_worker_main, args=(path, accs[i::n], f"{socket.gethostname()}:{os.getpid()}/{i}", pacing), daemon=True)
+             for i in range(n)]
+    for p in procs:
+        p.start()
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        for p in procs:
+            p.join(timeout=5)
@@ -0,0 +1,148 @@
+"""Per-request and per-gift instrumentation with optional JSONL export.
+
+Every HTTP call made through ``giftbot.client`` and every gift attempt is
+recorded with its endpoint, status, latency, bot, offerId and Epic
+``errorCode``. Events are aggregated in memory for ``summary()`` and, once
+``metrics.open(path)`` is called, also appended to a JSONL file.
+"""
+
+import contextlib, json, re, threading, time
+from collections import Counter, defaultdict
+from urllib.parse import urlsplit
+
+_ctx = threading.local()
+
+CATEGORIES = (
+    ("GiftCatalogEntry", "gift"),
+    ("QueryProfile", "profile"),
+    ("/oauth/token", "token"),
+    ("/oauth/", "auth"),
+    ("/deviceAuth", "auth"),
+    ("/public/account/displayName/", "resolve"),
+    ("/v2/shop", "shop"),
+)
+
+
+@contextlib.contextmanager
+def context(**kw):
+    """Attach fields (bot, offerId, ...) to every event recorded on this thread inside the block."""
+    old = getattr(_ctx, "values", {})
+    _ctx.values = {**old, **{k: v for k, v in kw.items() if v is not None}}
+    try:
+        yield
+    finally:
+        _ctx.values = old
+
+
+def current():
+    return getattr(_ctx, "values", {})
+
+
+def bot_label(bot):
+    return bot.get("displayName") or bot["accountId"][:12]
+
+
+def bot_context(bot, **kw):
+    """``context`` for calls made on behalf of ``bot``: its label for output, its accountId for pacing."""
+    return context(bot=bot_label(bot), accountId=bot["accountId"], **kw)
+
+
+def category(path):
+    for marker, cat in CATEGORIES:
+        if marker in path:
+            return cat
+    if path.endswith("/public/account"):
+        return "resolve"
+    if "/public/account/" in path:
+        return "account"
+    return "other"
+
+
+def endpoint(path):
+    path = re.sub(r"/[0-9a-f]{32}(?=/|$)", "/{accountId}", path)
+    return re.sub(r"/displayName/[^/]+", "/displayName/{name}", path)
+
+
+def error_code(r):
+    """Epic ``errorCode`` from a response body, if it carries one."""
+    if r is None:
+        return None
+    if r.status_code < 400 and "errorCode" not in (r.text or "")[:512]:
+        return None
+    try:
+        return (r.json() or {}).get("errorCode") or f"HTTP {r.status_code}"
+    except (ValueError, AttributeError):
+        return f"HTTP {r.status_code}"
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._f = None
+        self.path = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.http = defaultdict(lambda: [0, 0.0])
+            self.latencies = defaultdict(list)
+            self.gifts = Counter()
+            self.failures = defaultdict(Counter)
+
+    def open(self, path):
+        self.close()
+        self.path = path
+        self._f = open(path, "a", encoding="utf-8")
+
+    def close(self):
+        if self._f:
+            self._f.close()
+            self._f = None
+
+    def _write(self, ev):
+        if self._f:
+            line = json.dumps(ev)
+            with self._lock:
+                self._f.write(line + "\n")
+                self._f.flush()
+
+    def http_event(self, method, url, status, latency, code=None, attempt=0):
+        parts = urlsplit(url)
+        cat = category(parts.path)
+        with self._lock:
+            agg = self.http[cat]
+            agg[0] += 1
+            agg[1] += latency
+            self.latencies[cat].append(latency)
+        self._write({"ts": time.time(), "type": "http", "method": method, "host": parts.netloc, "endpoint": endpoint(parts.path),
+                     "category": cat, "status": status, "latencyMs": round(latency * 1000, 2), "errorCode": code,
+                     "attempt": attempt, **current()})
+
+    def gift_event(self, bot, offer_id, recipient_id, outcome, latency, code=None):
+        with self._lock:
+            self.gifts[outcome] += 1
+            self.latencies["gift_attempt"].append(latency)
+            if outcome not in ("sent", "skipped", "throttled"):
+                self.failures[bot_label(bot)][code or "unknown"] += 1
+        self._write({"ts": time.time(), "type": "gift", "bot": bot_label(bot), "accountId": bot["accountId"], "offerId": offer_id,
+                     "recipientId": recipient_id, "outcome": outcome, "latencyMs": round(latency * 1000, 2), "errorCode": code})
+
+    def summary(self):
+        elapsed = max(time.time() - self.started, 1e-9)
+        with self._lock:
+            total = sum(n for n, _ in self.http.values())
+            split = " | ".join(f"{cat} {n} ({t:.2f}s)" for cat, (n, t) in sorted(self.http.items(), key=lambda kv: -kv[1][1]))
+            sent, skipped, throttled = self.gifts["sent"], self.gifts["skipped"], self.gifts["throttled"]
+            lines = [f"HTTP: {total} requests" + (f" - {split}" if split else ""),
+                     f"Gifts: {sent} sent / {skipped} skipped / {sum(self.gifts.values()) - sent - skipped - throttled} failed"
+                     + (f" ({throttled} attempts throttled)" if throttled else "")
+                     + f" in {elapsed / 60:.1f} min ({sent * 60 / elapsed:.1f} gifts/min)"]
+            for bot, reasons in sorted(self.failures.items()):
+                lines.append(f"Failures {bot}: " + ", ".join(f"{code.rsplit('.', 1)[-1]} x{n}" for code, n in reasons.most_common()))
+        if self.path:
+            lines.append(f"Events written to {self.path}")
+        return lines
+
+
+metrics = Metrics()
@@ -0,0 +1,138 @@
+"""Adaptive request pacing driven by Epic's throttling responses.
+
+Requests are spaced per key: an endpoint category ("token", "gift", ...) or
+that category for a single bot (``"gift:<accountId>"``). A key runs at its floor
+(no delay unless configured) until the service pushes back with a 429, a
+``Retry-After`` header or ``errors.com.epicgames.common.throttled``. Then
+only that key is held off for the requested time and its interval doubles.
+Each accepted request halves it again, back towards the floor.
+"""
+
+import re, threading, time
+from email.utils import parsedate_to_datetime
+
+THROTTLED = "errors.com.epicgames.common.throttled"
+
+
+def key(category, bot=None):
+    return f"{category}:{bot}" if bot else category
+
+
+def _body(r):
+    try:
+        d = r.json()
+    except (ValueError, AttributeError):
+        return {}
+    return d if isinstance(d, dict) else {}
+
+
+def is_throttled(r):
+    if r is None:
+        return False
+    if r.status_code == 429:
+        return True
+    return r.status_code >= 400 and "throttl" in (r.text or "")[:512] and _body(r).get("errorCode") == THROTTLED
+
+
+def retry_after(r):
+    """Seconds the server asked us to wait: Retry-After (seconds or HTTP date), else the throttled error's messageVars."""
+    h = r.headers.get("Retry-After") if r is not None else None
+    if h:
+        try:
+            return max(float(h), 0.0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(h).timestamp() - time.time(), 0.0)
+            except (TypeError, ValueError):
+                pass
+    if r is None or r.status_code < 400:
+        return None
+    d = _body(r)
+    for v in d.get("messageVars") or []:
+        try:
+            return float(v)
+        except (TypeError, ValueError):
+            continue
+    m = re.search(r"(\d+(?:\.\d+)?)\s*second", d.get("errorMessage") or "")
+    return float(m.group(1)) if m else None
+
+
+class _Key:
+    __slots__ = ("floor", "interval", "next_at", "throttles")
+
+    def __init__(self, floor=0.0):
+        self.floor = floor
+        self.interval = floor
+        self.next_at = 0.0
+        self.throttles = 0
+
+
+class Pacer:
+    def __init__(self, step=1.0, ceiling=300.0):
+        self.step = step
+        self.ceiling = ceiling
+        self._keys = {}
+        self._lock = threading.Lock()
+
+    def _get(self, k):
+        st = self._keys.get(k)
+        if st is None:
+            st = self._keys[k] = _Key()
+        return st
+
+    def set_floor(self, k, seconds):
+        """Never send on ``k`` more often than every ``seconds`` (e.g. a bot's configured pacing)."""
+        with self._lock:
+            st = self._get(k)
+            st.floor = float(seconds or 0)
+            st.interval = max(st.interval, st.floor)
+
+    def delay(self, k):
+        """Seconds until ``k`` may send again, without reserving the slot."""
+        with self._lock:
+            st = self._keys.get(k)
+            return max(st.next_at - time.monotonic(), 0.0) if st else 0.0
+
+    def wait(self, k):
+        """Block until ``k`` may send and reserve the slot; concurrent callers are spaced by the interval."""
+        with self._lock:
+            st = self._keys.get(k)
+            if st is None or (not st.interval and not st.next_at):
+                return 0.0
+            now = time.monotonic()
+            at = max(now, st.next_at)
+            st.next_at = at + st.interval
+        if at > now:
+            time.sleep(at - now)
+        return at - now
+
+    def ok(self, k):
+        with self._lock:
+            st = self._keys.get(k)
+            if st and st.interval > st.floor:
+                st.interval = st.interval / 2 if st.interval / 2 > st.floor + 0.05 else st.floor
+
+    def throttled(self, k, after=None):
+        """Back ``k`` off after a throttled response; returns the seconds until it may send again."""
+        with self._lock:
+            st = self._get(k)
+            st.throttles += 1
+            st.interval = min(max(st.interval * 2, self.step, st.floor), self.ceiling)
+            now = time.monotonic()
+            st.next_at = max(st.next_at, now + (after if after is not None else st.interval))
+            return st.next_at - now
+
+    def summary(self, labels=None):
+        """One line per throttled key; ``labels`` maps the accountIds in bot keys to display names."""
+        labels = labels or {}
+        with self._lock:
+            hot = sorted((k, st.throttles, st.interval) for k, st in self._keys.items() if st.throttles)
+        lines = []
+        for k, n, interval in hot:
+            cat, _, bot = k.partition(":")
+            name = f"{key(cat, labels[bot])} ({bot[:8]})" if bot in labels else k
+            lines.append(f"Throttled {name}: {n}x, now every {interval:.1f}s")
+        return lines
+
+
+pacer = Pacer()
@@ -0,0 +1,156 @@
+"""Pre-flight gift plan for a shop run.
+
+Everything that can be decided from the shop snapshot alone is decided here,
+before any token grant or GiftCatalogEntry call: entries that are not
+giftable, free, too expensive or of an unwanted item type are dropped,
+bundles and the single-item entries they contain are de-duplicated, and the
+rest is ordered by policy and cut to the V-Buck budget.
+"""
+
+from collections import Counter
+
+from .shop import entry_name, entry_price
+
+ORDERS = ("shop", "price", "price-desc", "rarity")
+
+RARITY_RANK = {"common": 0, "uncommon": 1, "rare": 2, "epic": 3, "legendary": 4, "mythic": 5, "exotic": 5, "transcendent": 5}
+SERIES_RANK = 6  # marvel, dc, icon, gaminglegends, starwars, ...
+
+
+def item_types(e):
+    return {(b.get("type") or {}).get("value") for b in e.get("brItems") or []} - {None}
+
+
+def rarity(e):
+    """Highest rarity rank among the entry's items; series rarities rank above legendary."""
+    ranks = [RARITY_RANK.get(v, SERIES_RANK) for v in ((b.get("rarity") or {}).get("value") for b in e.get("brItems") or []) if v]
+    return max(ranks, default=-1)
+
+
+def rarity_name(e):
+    names = [(b.get("rarity") or {}).get("value") for b in e.get("brItems") or []]
+    return max((n for n in names if n), key=lambda n: RARITY_RANK.get(n, SERIES_RANK), default=None)
+
+
+def _item_ids(e):
+    return {b.get("id") for b in e.get("brItems") or []} - {None}
+
+
+def is_bundle(e):
+    return bool(e.get("bundle")) or len(_item_ids(e)) > 1
+
+
+def _reject(e, max_price, types, skip_types):
+    price = entry_price(e)
+    if not e.get("offerId"):
+        return "no offerId"
+    if not e.get("giftable", True):
+        return "not giftable"
+    if price <= 0:
+        return "free"
+    if max_price is not None and price > max_price:
+        return "over max price"
+    kinds = item_types(e)
+    if types and not kinds & types:
+        return "item type"
+    if skip_types and kinds and kinds <= skip_types:
+        return "item type"
+    return None
+
+
+def dedupe_bundles(entries):
+    """Split ``entries`` into (kept, [(entry, reason)]) so no cosmetic is planned twice.
+
+    A bundle is dropped when the single-item entries it overlaps with cover all
+    of its items for no more V-Bucks; otherwise those single entries are
+    dropped and the bundle delivers them.
+    """
+    singles = {}
+    for e in entries:
+        if not is_bundle(e):
+            for i in _item_ids(e):
+                singles.setdefault(i, e)
+    drop = {}
+    for b in (e for e in entries if is_bundle(e)):
+        ids = _item_ids(b)
+        inside = {id(s): s for i in ids if (s := singles.get(i)) is not None and id(s) not in drop}
+        if not inside:
+            continue
+        covered = set().union(*(_item_ids(s) for s in inside.values()))
+        if ids <= covered and sum(entry_price(s) for s in inside.values()) <= entry_price(b):
+            drop[id(b)] = "items sold separately for less"
+        else:
+            for k, s in inside.items():
+                drop[k] = f"included in {entry_name(b)}"
+    return [e for e in entries if id(e) not in drop], [(e, drop[id(e)]) for e in entries if id(e) in drop]
+
+
+class GiftPlan:
+    """Entries to gift in order, plus every dropped entry with the reason."""
+
+    def __init__(self, entries, dropped, budget=None):
+        self.entries = entries
+        self.dropped = dropped
+        self.budget = budget
+
+    @property
+    def total(self):
+        return sum(entry_price(e) for e in self.entries)
+
+    def reasons(self):
+        return Counter(reason if not reason.startswith("included in ") else "in a bundle" for _, reason in self.dropped)
+
+    def lines(self):
+        out = []
+        for i, e in enumerate(self.entries, 1):
+            tags = sorted(item_types(e)) + [r for r in (rarity_name(e),) if r]
+            out.append(f"{i:>3}. {entry_name(e)} ({entry_price(e)} VB)" + (f" [{', '.join(tags)}]" if tags else ""))
+        out.append(f"Plan: {len(self.entries)} gifts, {self.total} V-Bucks" + (f" (budget {self.budget})" if self.budget is not None else ""))
+        if self.dropped:
+            out.append("Dropped: " + ", ".join(f"{n} {reason}" for reason, n in self.reasons().most_common()))
+        return out
+
+    def to_dict(self):
+        return {"total": self.total, "budget": self.budget, "count": len(self.entries),
+                "entries": [{"offerId": e.get("offerId"), "item": entry_name(e), "price": entry_price(e)} for e in self.entries],
+                "dropped": [{"offerId": e.get("offerId"), "item": entry_name(e), "price": entry_price(e), "reason": r} for e, r in self.dropped]}
+
+
+def plan_gifts(entries, order="shop", budget=None, max_price=None, types=None, skip_types=None):
+    """Build a ``GiftPlan`` from shop entries.
+
+    ``order`` is one of ``ORDERS``: shop order, cheapest first, most expensive
+    first, or rarest first. ``budget`` caps the total V-Bucks; entries that
+    do not fit are dropped, cheaper ones further down can still fill the gap.
+    """
+    if order not in ORDERS:
+        raise ValueError(f"unknown order {order!r}, expected one of {', '.join(ORDERS)}")
+    types, skip_types = set(types or ()), set(skip_types or ())
+    kept, dropped, seen = [], [], set()
+    for e in entries:
+        reason = _reject(e, max_price, types, skip_types)
+        if not reason and e["offerId"] in seen:
+            reason = "duplicate offer"
+        if reason:
+            dropped.append((e, reason))
+            continue
+        seen.add(e["offerId"])
+        kept.append(e)
+    kept, dupes = dedupe_bundles(kept)
+    dropped += dupes
+    if order == "price":
+        kept.sort(key=entry_price)
+    elif order == "price-desc":
+        kept.sort(key=entry_price, reverse=True)
+    elif order == "rarity":
+        kept.sort(key=lambda e: (-rarity(e), -entry_price(e)))
+    if budget is not None:
+        fit, spent = [], 0
+        for e in kept:
+            if spent + entry_price(e) <= budget:
+                fit.append(e)
+                spent += entry_price(e)
+            else:
+                dropped.append((e, "over budget"))
+        kept = fit
+    return GiftPlan(kept, dropped, budget)
@@ -0,0 +1,138 @@
+"""Recipient resolution: displayName -> accountId with a persistent cache.
+
+Names are cached with a TTL in ``recipients_cache.json``, and names that
+don't exist are kept in a shorter-lived negative cache. Expired entries are
+revalidated in bulk through the multi-id account lookup (100 ids per call);
+only names that are new or have changed owner need a displayName GET.
+"""
+
+import json, threading, time
+from concurrent.futures import ThreadPoolExecutor
+
+from .accounts import atomic_write_json
+from .client import client
+from .epic import ACCOUNT
+
+CACHE = "recipients_cache.json"
+BATCH = 100
+
+
+def is_account_id(s):
+    return len(s) == 32 and all(c in "0123456789abcdef" for c in s.lower())
+
+
+def _lookup(name, token):
+    """(status_code, accountId) for a displayName; status 0 on network errors."""
+    try:
+        r = client.get(f"{ACCOUNT}/public/account/displayName/{name}", headers={"Authorization": "Bearer " + token}, timeout=10)
+    except Exception:
+        return 0, None
+    return r.status_code, r.json().get("id") if r.status_code == 200 else None
+
+
+def lookup_account_ids(ids, token):
+    """{accountId: displayName} from the multi-id lookup, in batches of 100."""
+    found = {}
+    for i in range(0, len(ids), BATCH):
+        try:
+            r = client.get(f"{ACCOUNT}/public/account", params=[("accountId", a) for a in ids[i:i + BATCH]],
+                headers={"Authorization": "Bearer " + token}, timeout=10)
+        except Exception:
+            continue
+        if r.status_code == 200:
+            for a in r.json() or []:
+                found[a.get("id")] = a.get("displayName") or ""
+    return found
+
+
+class Resolver:
+    def __init__(self, path=CACHE, ttl=7 * 86400, negative_ttl=3600, workers=8):
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.workers = workers
+        self.lookups = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+        self._names, self._missing = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, "r") as f:
+                d = json.load(f)
+            return d.get("names") or {}, d.get("missing") or {}
+        except (OSError, ValueError):
+            return {}, {}
+
+    def save(self):
+        """Write the cache; it is only an optimisation, so a failed write is ignored."""
+        with self._lock:
+            try:
+                atomic_write_json(self.path, {"names": self._names, "missing": self._missing})
+            except OSError:
+                pass
+
+    def _token(self, tokens, accs):
+        for acc in accs:
+            tok = tokens.get(acc)
+            if tok:
+                return tok
+        return None
+
+    def resolve_many(self, names, tokens, accs):
+        """{name.lower(): accountId or None} for every name, with as few round-trips as possible."""
+        now = time.time()
+        out, expired, todo = {}, {}, []
+        for name in dict.fromkeys(n.strip() for n in names if n and n.strip()):
+            key = name.lower()
+            if key in out:
+                continue
+            if is_account_id(name):
+                out[key] = key
+            elif key in self._names and now - self._names[key][1] < self.ttl:
+                out[key] = self._names[key][0]
+                self.hits += 1
+            elif key in self._missing and now - self._missing[key] < self.negative_ttl:
+                out[key] = None
+                self.hits += 1
+            elif key in self._names:
+                expired[self._names[key][0]] = name
+            else:
+                todo.append(name)
+        if not expired and not todo:
+            return out
+        tok = self._token(tokens, accs)
+        if not tok:
+            out.update({n.lower(): None for n in [*expired.values(), *todo]})
+            return out
+        if expired:
+            self.lookups += -(-len(expired) // BATCH)
+            current = lookup_account_ids(list(expired), tok)
+            for aid, name in expired.items():
+                if current.get(aid, "").lower() == name.lower():
+                    self._names[name.lower()] = [aid, now]
+                    out[name.lower()] = aid
+                else:
+                    todo.append(name)
+        if todo:
+            self.lookups += len(todo)
+            with ThreadPoolExecutor(max_workers=self.workers) as ex:
+                for name, (status, aid) in zip(todo, ex.map(lambda n: _lookup(n, tok), todo)):
+                    key = name.lower()
+                    out[key] = aid
+                    if aid:
+                        self._names[key] = [aid, now]
+                        self._missing.pop(key, None)
+                    elif status == 404:
+                        self._missing[key] = now
+                        self._names.pop(key, None)
+        self.save()
+        return out
+
+
+resolver = Resolver()
+
+
+def resolve_recipient(name, tokens, accs):
+    """accountId for a displayName (or an accountId passed through)."""
+    return resolver.resolve_many([name], tokens, accs).get(name.strip().lower())
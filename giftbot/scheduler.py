@@ -0,0 +1,158 @@
+"""Bot capacity model: V-Buck balance and rolling daily gift count per bot.
+
+Balances come from a common_core QueryProfile and are then kept current
+from each gift's ``profileChanges``, so a bot is only picked for an entry
+it can actually pay for and still has gift quota left for.
+"""
+
+import threading, time
+from datetime import datetime
+
+from .client import client
+from .epic import MCP
+from .metrics import bot_context
+from .pacing import key, pacer
+
+DAY = 86400
+
+
+def _ts(s):
+    try:
+        return datetime.fromisoformat(s.replace("Z", "+00:00")).timestamp()
+    except (AttributeError, ValueError):
+        return 0.0
+
+
+def query_profile(bot, token):
+    try:
+        with bot_context(bot):
+            r = client.post(f"{MCP}/profile/{bot['accountId']}/client/QueryProfile?profileId=common_core&rvn=-1",
+                json={}, headers={"Authorization": "Bearer " + token}, timeout=10, idempotent=True)
+    except Exception:
+        return None
+    if r.status_code != 200:
+        return None
+    for ch in r.json().get("profileChanges") or []:
+        if ch.get("profile"):
+            return ch["profile"]
+    return None
+
+
+class BotState:
+    def __init__(self):
+        self.mtx = {}
+        self.sent = []
+        self.updated = 0.0
+        self.blocked = False
+
+    @property
+    def balance(self):
+        return sum(self.mtx.values())
+
+    def gifts_today(self, now=None):
+        cutoff = (now or time.time()) - DAY
+        return sum(1 for t in self.sent if t > cutoff)
+
+    def load_profile(self, profile):
+        self.mtx = {k: int(v.get("quantity") or 0) for k, v in (profile.get("items") or {}).items()
+                    if (v.get("templateId") or "").startswith("Currency:Mtx")}
+        hist = ((profile.get("stats") or {}).get("attributes") or {}).get("gift_history") or {}
+        cutoff = time.time() - DAY
+        dates = [g.get("date") for g in hist["gifts"]] if hist.get("gifts") else list((hist.get("sentTo") or {}).values())
+        recent = [t for t in map(_ts, dates) if t > cutoff]
+        self.sent = sorted(recent)
+        self.updated = time.time()
+
+    def apply_changes(self, changes, price):
+        seen = False
+        for ch in changes or []:
+            if ch.get("changeType") == "fullProfileUpdate" and ch.get("profile"):
+                self.load_profile(ch["profile"])
+                seen = True
+            elif ch.get("changeType") == "itemQuantityChanged" and ch.get("itemId") in self.mtx:
+                self.mtx[ch["itemId"]] = int(ch.get("quantity") or 0)
+                seen = True
+        if not seen and self.mtx:
+            k = max(self.mtx, key=self.mtx.get)
+            self.mtx[k] = max(self.mtx[k] - price, 0)
+
+
+class BotScheduler:
+    """Chooses a bot that can pay for an entry before anything is sent.
+
+    ``daily_quota`` is the number of gifts a bot may send per rolling 24h;
+    balances older than ``max_age`` seconds are re-queried.
+    """
+
+    def __init__(self, accs, tokens, daily_quota=5, max_age=600):
+        self.accs = accs
+        self.tokens = tokens
+        self.daily_quota = daily_quota
+        self.max_age = max_age
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def state(self, bot):
+        with self._lock:
+            st = self._states.setdefault(bot["accountId"], BotState())
+        if time.time() - st.updated > self.max_age:
+            self.refresh(bot, st)
+        return st
+
+    def refresh(self, bot, st=None):
+        st = st or self._states.setdefault(bot["accountId"], BotState())
+        tok = self.tokens.get(bot)
+        profile = query_profile(bot, tok) if tok else None
+        if profile:
+            st.load_profile(profile)
+            st.blocked = False
+        else:
+            st.blocked = True
+            st.updated = time.time()
+        return st
+
+    def observe(self, bot, profile):
+        """Seed a bot's state from a common_core profile fetched elsewhere (e.g. the health check)."""
+        with self._lock:
+            st = self._states.setdefault(bot["accountId"], BotState())
+        st.load_profile(profile)
+        st.blocked = False
+
+    def can_pay(self, bot, price):
+        st = self.state(bot)
+        return not st.blocked and st.balance >= price and st.gifts_today() < self.daily_quota
+
+    def max_price(self):
+        """Largest price some bot with quota left can still pay, 0 when none can."""
+        return max((self.state(b).balance for b in self.accs if self.can_pay(b, 0)), default=0)
+
+    def pick(self, price, exclude=()):
+        """First bot in config order that can pay ``price`` and has quota left, else None.
+
+        Bots the pacer is holding back after throttling are only picked when no
+        other bot is ready, and then the one that is free soonest.
+        """
+        waiting = []
+        for bot in self.accs:
+            if bot["accountId"] not in exclude and self.can_pay(bot, price):
+                delay = pacer.delay(key("gift", bot["accountId"]))
+                if not delay:
+                    return bot
+                waiting.append((delay, len(waiting), bot))
+        return min(waiting)[2] if waiting else None
+
+    def record(self, bot, price, body):
+        st = self.state(bot)
+        st.sent.append(time.time())
+        st.apply_changes((body or {}).get("profileChanges"), price)
+
+    def failed(self, bot):
+        """A gift the model expected to succeed was refused: bench the bot until its next re-query."""
+        with self._lock:
+            st = self._states.setdefault(bot["accountId"], BotState())
+        st.blocked = True
+        st.updated = time.time()
+
+    def describe(self, bot):
+        st = self.state(bot)
+        return f"{st.balance} VB, {st.gifts_today()}/{self.daily_quota} gifts today" + (" (unavailable)" if st.blocked else "")
@@ -0,0 +1,139 @@
+"""Item shop helpers: an on-disk shop snapshot, a name index and entry accessors.
+
+The snapshot keeps only the fields the bot uses, with jam tracks already
+removed, so repeated gifts never download or re-parse the full
+fortnite-api payload. It is refreshed after the daily 00:00 UTC rotation,
+using a conditional GET when the API sent an ETag / Last-Modified.
+"""
+
+import json, re, time
+from datetime import datetime, timedelta, timezone
+
+from .accounts import atomic_write_json
+from .client import client
+from .epic import SHOP_URL
+
+SNAPSHOT = "shop_cache.json"
+
+
+def is_jam_track(e):
+    ly = e.get("layout") or {}
+    nm_ly = (ly.get("name") or "").lower()
+    return bool(e.get("tracks") or ("jam" in nm_ly and "track" in nm_ly) or (ly.get("id") or "").upper().startswith("JT"))
+
+
+def entry_name(e):
+    if e.get("name"):
+        return e["name"]
+    br = e.get("brItems") or []
+    nm = br[0].get("name") if br else (e.get("bundle") or {}).get("name") or ""
+    if not nm:
+        m = re.search(r"\d+\s*x\s+(.+?)\s+for\s+\d+", (e.get("devName") or ""), re.I)
+        nm = m.group(1).strip() if m else (e.get("devName") or "")
+    return nm or ""
+
+
+def entry_price(e):
+    return e.get("finalPrice") or e.get("regularPrice") or 0
+
+
+def normalize(s):
+    return re.sub(r"[^a-z0-9]", "", (s or "").lower())
+
+
+def slug_from_url(url):
+    """Item slug from a fortnite.com item-shop URL, without the trailing 8-hex id."""
+    m = re.search(r"/item-shop/[^/]+/([^/?#]+)", url) or re.search(r"/([a-zA-Z0-9-]+?-[a-f0-9]{8})(?:[/?#]|$)", url)
+    return re.sub(r"-[a-f0-9]{8}$", "", m.group(1).lower()) if m else None
+
+
+def _slim(e):
+    br = [{"id": b.get("id"), "name": b.get("name"), "type": {"value": (b.get("type") or {}).get("value")},
+           "rarity": {"value": (b.get("rarity") or {}).get("value")}} for b in e.get("brItems") or []]
+    return {"offerId": e.get("offerId"), "name": entry_name(e), "devName": e.get("devName"), "finalPrice": e.get("finalPrice"),
+            "regularPrice": e.get("regularPrice"), "giftable": e.get("giftable", True), "brItems": br,
+            "bundle": {"name": (e.get("bundle") or {}).get("name")} if e.get("bundle") else None}
+
+
+def next_rotation(ts):
+    d = datetime.fromtimestamp(ts, timezone.utc)
+    return (d.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)).timestamp()
+
+
+class ShopSnapshot:
+    def __init__(self, entries, fetched_at=0.0, etag=None, last_modified=None):
+        self.entries = entries
+        self.fetched_at = fetched_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self._build_index()
+
+    def _build_index(self):
+        self.names = [normalize(e.get("name")) for e in self.entries]
+        self.index = {}
+        for i, e in enumerate(self.entries):
+            for key in {self.names[i], normalize(e.get("offerId")), *(normalize(b.get("name")) for b in e.get("brItems") or [])}:
+                if key:
+                    self.index.setdefault(key, i)
+
+    @property
+    def stale(self):
+        return time.time() >= next_rotation(self.fetched_at)
+
+    def find(self, query):
+        """Entry for an item name, URL slug or offerId: exact index hit first, then first substring match."""
+        q = normalize(query)
+        if not q:
+            return None
+        if q in self.index:
+            return self.entries[self.index[q]]
+        for i, nm in enumerate(self.names):
+            if q in nm:
+                return self.entries[i]
+        return None
+
+    def to_json(self):
+        return {"fetched_at": self.fetched_at, "etag": self.etag, "last_modified": self.last_modified, "entries": self.entries}
+
+    @classmethod
+    def from_json(cls, d):
+        return cls(d.get("entries") or [], d.get("fetched_at") or 0.0, d.get("etag"), d.get("last_modified"))
+
+
+def _read(path):
+    try:
+        with open(path, "r") as f:
+            return ShopSnapshot.from_json(json.load(f))
+    except (OSError, ValueError):
+        return None
+
+
+_current = {}
+
+
+def load_shop(path=SNAPSHOT, force=False):
+    """Current shop snapshot, fetching only after rotation (or when ``force``) and keeping the old one on errors."""
+    snap = _current.get(path) or _read(path)
+    if snap and not force and not snap.stale:
+        _current[path] = snap
+        return snap
+    headers = {}
+    if snap and snap.etag:
+        headers["If-None-Match"] = snap.etag
+    if snap and snap.last_modified:
+        headers["If-Modified-Since"] = snap.last_modified
+    try:
+        r = client.get(SHOP_URL, headers=headers, timeout=15)
+        if r.status_code == 304 and snap:
+            snap.fetched_at = time.time()
+        elif r.status_code == 200:
+            entries = r.json().get("data", {}).get("entries", []) or []
+            snap = ShopSnapshot([_slim(e) for e in entries if not is_jam_track(e)], time.time(), r.headers.get("ETag"), r.headers.get("Last-Modified"))
+        else:
+            return snap or ShopSnapshot([])
+        atomic_write_json(path, snap.to_json())
+    except Exception:
+        if not snap:
+            return ShopSnapshot([])
+    _current[path] = snap
+    return snap
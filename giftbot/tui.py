@@ -0,0 +1,267 @@
+"""Interactive menu panel. Only this module needs colorama, fade and webbrowser."""
+
+import os, sys, time, webbrowser
+from colorama import Fore, Style, init
+import fade
+
+from .accounts import store as default_store
+from .auth import TokenManager, create_device_auth, exchange_code, poll_device_login, start_device_login
+from .gifting import SENT, SKIPPED, ShopGifter, gift_entry
+from .health import SORT_KEYS, check_all, table
+from .metrics import bot_label, metrics
+from .pacing import pacer
+from .plan import ORDERS, plan_gifts
+from .resolve import resolve_recipient
+from .scheduler import BotScheduler
+from .shop import entry_name, entry_price, load_shop, slug_from_url
+
+ART = """
+                                                d8P                         
+                                             d888888P                       
+           88bd8b,d88b  d8888b ?88   d8P  d8P  ?88'   ?88   d8P  d8P d8888b 
+           88P'`?8P'?8bd8b_,dP d88  d8P' d8P'  88P    d88  d8P' d8P'd8P' ?88
+          d88  d88  88P88b     ?8b ,88b ,88'   88b    ?8b ,88b ,88' 88b  d88
+         d88' d88'  88b`?888P' `?888P'888P'    `?8b   `?888P'888P'  `?8888P'
+
+                                                            V1.0.5
+    """
+
+
+def run(store=None):
+    store = store or default_store
+    init(autoreset=True)
+    banner = Fore.MAGENTA + fade.purplepink(ART) + Style.RESET_ALL
+    tokens = TokenManager()
+    scheduler = BotScheduler([], tokens)
+
+    while True:
+        try:
+            print("\033[2J\033[H", end="", flush=True)
+        except:
+            try:
+                os.system("cls" if os.name == "nt" else "clear")
+            except:
+                pass
+
+        print(banner)
+
+        print(f"{Fore.MAGENTA}Menu{Style.RESET_ALL}")
+        print(f"{Fore.MAGENTA}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━{Style.RESET_ALL}")
+        print(f"  [{Fore.MAGENTA}1{Style.RESET_ALL}] Add Epic account")
+        print(f"  [{Fore.MAGENTA}2{Style.RESET_ALL}] View linked accounts")
+        print(f"  [{Fore.MAGENTA}3{Style.RESET_ALL}] Remove account")
+        print(f"  [{Fore.MAGENTA}4{Style.RESET_ALL}] Generate exchange code")
+        print(f"  [{Fore.MAGENTA}5{Style.RESET_ALL}] Gift item")
+        print(f"  [{Fore.MAGENTA}6{Style.RESET_ALL}] Gift entire shop")
+        print(f"  [{Fore.MAGENTA}0{Style.RESET_ALL}] Exit\n")
+        choice = input("Choice: ").strip()
+
+        if choice == "1":
+            try:
+                print("\033[2J\033[H", end="", flush=True)
+            except:
+                pass
+            print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Starting Epic Device Authentication")
+            auth = start_device_login()
+            with open(os.devnull, "w") as dn:
+                _ = sys.stderr
+                sys.stderr = dn
+                try:
+                    webbrowser.open(auth["verification_uri_complete"])
+                finally:
+                    sys.stderr = _
+            login = poll_device_login(auth)
+            if not login:
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Login code expired. Try again.")
+                input("\nPress ENTER to continue...")
+                continue
+            print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Authenticated account {login['account_id']}")
+            device_auth = create_device_auth(login)
+            if not store.add(device_auth):
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Account already exists")
+            else:
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Account saved")
+            input("\nPress ENTER to continue...")
+
+        elif choice == "2":
+            try:
+                print("\033[2J\033[H", end="", flush=True)
+            except:
+                pass
+            accs = store.all()
+            print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Linked accounts: {len(accs)} - checking...")
+            t0 = time.monotonic()
+            results = check_all(accs, tokens, store=store)
+            for r in results:
+                if r["profile"]:
+                    scheduler.observe(store.get(r["accountId"]) or {"accountId": r["accountId"]}, r["profile"])
+            sort = "name"
+            while sort in SORT_KEYS:
+                print()
+                for line in table(sorted(results, key=SORT_KEYS[sort])):
+                    print(f"    {line}")
+                print(f"\n    [{Fore.MAGENTA}!{Style.RESET_ALL}] {sum(r['status'] == 'ok' for r in results)}/{len(results)} ok in {time.monotonic() - t0:.1f}s")
+                sort = input(f"\n  Sort by ({'/'.join(sorted(SORT_KEYS))}, ENTER = back): ").strip().lower()
+            continue
+
+        elif choice == "3":
+            try:
+                print("\033[2J\033[H", end="", flush=True)
+            except:
+                pass
+            accs = store.all()
+            for i, a in enumerate(accs):
+                print(f"  [{i}] {a.get('displayName') or a['accountId'][:12]+'...'} ({a['accountId']})")
+            idx = input("\nIndex to remove: ").strip()
+            if idx.isdigit() and int(idx) < len(accs) and store.remove(accs[int(idx)]["accountId"]):
+                tokens.invalidate(accs[int(idx)]["accountId"])
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Account removed")
+            input("\nPress ENTER to continue...")
+
+        elif choice == "4":
+            try:
+                print("\033[2J\033[H", end="", flush=True)
+            except:
+                pass
+            accs = store.all()
+            if not accs:
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] No accounts")
+            else:
+                for i, a in enumerate(accs):
+                    print(f"  [{i}] {a.get('displayName') or a['accountId'][:12]} ({a['accountId']})")
+                idx = input("\nIndex: ").strip()
+                if idx.isdigit() and int(idx) < len(accs):
+                    acc = accs[int(idx)]
+                    try:
+                        tok = tokens.get(acc)
+                        if tok:
+                            code = exchange_code(tok)
+                            if code:
+                                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Exchange code: {code}")
+                                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Login link: https://www.epicgames.com/id/exchange?exchangeCode={code}")
+                            else:
+                                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Failed to get exchange code")
+                        else:
+                            print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Invalid device auth")
+                    except:
+                        print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Invalid device auth")
+            input("\nPress ENTER to continue...")
+
+        elif choice == "5":
+            try:
+                print("\033[2J\033[H", end="", flush=True)
+            except:
+                pass
+            metrics.reset()
+            accs = store.all()
+            if not accs:
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] No bot accounts linked. Add accounts first.")
+                input("\nPress ENTER to continue...")
+                continue
+            print(f"  {Fore.MAGENTA}Gift Item{Style.RESET_ALL}\n  {Fore.MAGENTA}─────────{Style.RESET_ALL}\n")
+            url_in = input("  Item shop URL (e.g. fortnite.com/item-shop/emotes/...): ").strip()
+            slug = slug_from_url(url_in) if url_in else None
+            if not slug:
+                slug = input("  Or enter item name (e.g. femininomenon): ").strip().lower()
+            if not slug:
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] No item specified")
+                input("\nPress ENTER to continue...")
+                continue
+            username = input("  Recipient username: ").strip()
+            if not username:
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] No recipient specified")
+                input("\nPress ENTER to continue...")
+                continue
+            entry = load_shop().find(slug)
+            if not entry:
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Item not found in shop: {slug}")
+                input("\nPress ENTER to continue...")
+                continue
+            price = entry_price(entry)
+            name = entry_name(entry)
+            print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Found: {name} ({price} V-Bucks)")
+            recipient_id = resolve_recipient(username, tokens, accs)
+            if not recipient_id:
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Could not resolve username to account ID")
+                input("\nPress ENTER to continue...")
+                continue
+            print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Recipient: {username} -> {recipient_id}")
+            scheduler.accs = accs
+
+            def trying(bot):
+                print(f"\n  [{Fore.MAGENTA}Bot{accs.index(bot)+1}{Style.RESET_ALL}] Trying {bot.get('displayName') or bot['accountId'][:12]} ({bot['accountId'][:8]}...) - {scheduler.describe(bot)}")
+
+            outcome, bot = gift_entry(entry, recipient_id, tokens, scheduler, on_attempt=trying)
+            if outcome == SENT:
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}]   {Fore.MAGENTA}SUCCESS{Style.RESET_ALL} - {name} sent!")
+            elif outcome == SKIPPED:
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}]   Skipped (recipient owns / item not giftable)")
+            elif not bot:
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] No bot has {price} V-Bucks and a gift left today")
+            else:
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] All bots failed (limit/vbucks)")
+            print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] {tokens.summary()}")
+            for line in metrics.summary() + pacer.summary({a["accountId"]: bot_label(a) for a in accs}):
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] {line}")
+            input("\nPress ENTER to continue...")
+
+        elif choice == "6":
+            try:
+                print("\033[2J\033[H", end="", flush=True)
+            except:
+                pass
+            metrics.reset()
+            accs = store.all()
+            if not accs:
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] No bot accounts linked. Add accounts first.")
+                input("\nPress ENTER to continue...")
+                continue
+            print(f"  {Fore.MAGENTA}Gift Entire Shop{Style.RESET_ALL}\n  {Fore.MAGENTA}───────────────{Style.RESET_ALL}\n")
+            print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Jam Tracks will be skipped.")
+            username = input("  Recipient username: ").strip()
+            if not username:
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] No recipient specified")
+                input("\nPress ENTER to continue...")
+                continue
+            order = input(f"  Order ({'/'.join(ORDERS)}, ENTER = shop): ").strip().lower()
+            budget = input("  V-Buck budget (ENTER = no cap): ").strip()
+            print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Loading shop...")
+            plan = plan_gifts(load_shop().entries, order=order if order in ORDERS else "shop", budget=int(budget) if budget.isdigit() else None)
+            for line in plan.lines():
+                print(f"  {line}")
+            if not plan.entries or input(f"  Gift these {len(plan.entries)} items for {plan.total} V-Bucks? (y/N): ").strip().lower() != "y":
+                input("\nPress ENTER to continue...")
+                continue
+            recipient_id = resolve_recipient(username, tokens, accs)
+            if not recipient_id:
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Could not resolve username to account ID")
+                input("\nPress ENTER to continue...")
+                continue
+            print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] Recipient: {username} -> {recipient_id}")
+            n = input(f"  Bots in parallel (1-{len(accs)}, ENTER = all): ").strip()
+            pool = accs[:int(n)] if n.isdigit() and 0 < int(n) <= len(accs) else accs
+            done = [0]
+
+            def report(entry, bot, outcome):
+                done[0] += 1
+                who = (bot.get("displayName") or bot["accountId"][:12]) if bot else "-"
+                label = {SENT: f"{Fore.MAGENTA}SUCCESS{Style.RESET_ALL}", SKIPPED: "Skipped (owns / not giftable)"}.get(outcome, "Failed (no bot left with limit/vbucks)")
+                print(f"  [{done[0]}/{len(plan.entries)}] {entry_name(entry)} ({entry_price(entry)} VB) - Bot: {who} - {label}")
+
+            scheduler.accs = accs
+            engine = ShopGifter(pool, tokens, recipient_id, on_result=report, scheduler=scheduler)
+            results = engine.run(plan.entries)
+            sent_count = sum(1 for _, _, o in results if o == SENT)
+            skipped_count = sum(1 for _, _, o in results if o == SKIPPED)
+            if not any(not st.retired for st in engine.stats):
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}]   No more bots. Stopping.")
+            for line in engine.summary():
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] {line}")
+            print(f"\n    [{Fore.MAGENTA}!{Style.RESET_ALL}] Done. Sent: {sent_count} | Skipped: {skipped_count}")
+            print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] {tokens.summary()}")
+            for line in metrics.summary() + pacer.summary({a["accountId"]: bot_label(a) for a in accs}):
+                print(f"    [{Fore.MAGENTA}!{Style.RESET_ALL}] {line}")
+            input("\nPress ENTER to continue...")
+
+        elif choice == "0":
+            return